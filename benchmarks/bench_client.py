@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Throughput and tail latency of the clients against the local simulator.
+#
+#   python benchmarks/bench_client.py --output report.json
+#   python benchmarks/bench_client.py --baseline report.json   # exits 1 on regression
+#
+# Every scenario runs a fixed number of calls with a fixed random seed, so reports of
+# two commits on the same machine are comparable. The simulator shares the process (and
+# the GIL) with the client, so the numbers are for comparison, not absolute capacity.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+import argparse, json, os, platform, random, subprocess, sys, threading, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import python_bitbankcc
+from simulator import Simulator, PAIRS
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(int(q * len(samples)), len(samples) - 1)] if samples else None
+
+
+def run_threads(threads, calls, fn):
+    # splits calls over threads, returns the latency of every call and the wall time
+    latencies = []
+    lock = threading.Lock()
+    def worker(n):
+        mine = []
+        for _ in range(n):
+            start = time.perf_counter()
+            fn()
+            mine.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(mine)
+    counts = [calls // threads + (1 if i < calls % threads else 0) for i in range(threads)]
+    workers = [threading.Thread(target=worker, args=(n,)) for n in counts]
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return latencies, time.perf_counter() - started
+
+
+def scenarios(sim, args):
+    config = {'end_point': sim.private_end_point, 'pool_size': max(args.threads, 30)}
+    pub = python_bitbankcc.public(sim.public_end_point, config={'pool_size': max(args.threads, len(PAIRS))})
+    prv = python_bitbankcc.private(sim.api_key, sim.api_secret, config=config)
+    ladder = [{'pair': 'btc_jpy', 'price': str(4000000 + i), 'amount': '0.001', 'side': 'buy', 'order_type': 'limit'}
+              for i in range(30)]
+
+    def requote():
+        results = prv.order_many(ladder)
+        prv.cancel_orders_many([('btc_jpy', order['order_id']) for order in results])
+
+    yield 'public_ticker_sequential', 1, args.calls, lambda: pub.get_ticker('btc_jpy'), 1
+    yield 'private_asset_threads', args.threads, args.calls, prv.get_asset, 1
+    yield 'private_active_orders_threads', args.threads, args.calls, lambda: prv.get_active_orders('btc_jpy'), 1
+    yield 'public_depth_batch', 1, max(args.calls // len(PAIRS), 1), lambda: pub.get_depth_many(PAIRS), len(PAIRS)
+    yield 'private_requote_30', 1, max(args.calls // 60, 1), requote, 60
+    pub.close()
+    prv.close()
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except Exception:
+        return None
+
+
+def compare(report, baseline, max_regression):
+    failed = False
+    old = baseline['scenarios']
+    for name, result in report['scenarios'].items():
+        if name not in old:
+            continue
+        for key, worse_when_higher in [('throughput', False), ('p99_ms', True)]:
+            change = (result[key] - old[name][key]) / old[name][key]
+            regression = change if worse_when_higher else -change
+            flag = 'REGRESSION' if regression > max_regression else ''
+            failed = failed or bool(flag)
+            print('%-32s %-10s %10.2f -> %10.2f  %+6.1f%% %s' % (name, key, old[name][key], result[key], change * 100, flag))
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=600)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.002, help='simulated server time in seconds')
+    parser.add_argument('--jitter', type=float, default=0.001)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write the report as JSON')
+    parser.add_argument('--baseline', help='compare with a previous report')
+    parser.add_argument('--max-regression', type=float, default=0.2)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'args': dict((k, v) for k, v in vars(args).items() if k not in ('output', 'baseline')),
+        'scenarios': {},
+    }
+    with Simulator(latency=args.latency, jitter=args.jitter) as sim:
+        for name, threads, calls, fn, requests_per_call in scenarios(sim, args):
+            fn()  # warm up the connection pool
+            latencies, elapsed = run_threads(threads, calls, fn)
+            result = report['scenarios'][name] = {
+                'threads': threads,
+                'calls': calls,
+                'throughput': calls * requests_per_call / elapsed,
+                'p50_ms': percentile(latencies, 0.5) * 1e3,
+                'p99_ms': percentile(latencies, 0.99) * 1e3,
+                'max_ms': max(latencies) * 1e3,
+            }
+            print('%-32s %3d threads  %8.1f req/s  p50 %7.2f ms  p99 %7.2f ms' % (
+                name, threads, result['throughput'], result['p50_ms'], result['p99_ms']))
+        if sim.auth_failures:
+            print('simulator rejected %d signatures' % sim.auth_failures)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            if compare(report, json.load(f), args.max_regression):
+                sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Compares the old response.json() dict path with the bytes decoder and the
+# typed models on synthetic get_depth / get_transactions payloads.
+#
+#   python benchmarks/bench_decode.py [-n 50]
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+import argparse, json, logging, os, sys, time, tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import requests
+from python_bitbankcc import Depth, Trade, Transactions
+from python_bitbankcc.utils import try_json_parse, fastest_json_decoder
+
+
+logger = logging.getLogger(__name__)
+
+
+def make_payloads():
+    depth = {
+        'asks': [[str(5000000 + i), '%.4f' % (0.01 * (i % 97 + 1))] for i in range(2000)],
+        'bids': [[str(4999999 - i), '%.4f' % (0.01 * (i % 89 + 1))] for i in range(2000)],
+        'timestamp': 1600000000000,
+        'sequenceId': '123456',
+    }
+    transactions = {'transactions': [{
+        'transaction_id': 100000 + i,
+        'side': 'buy' if i % 2 else 'sell',
+        'price': str(5000000 + i % 1000),
+        'amount': '%.4f' % (0.0001 * (i % 500 + 1)),
+        'executed_at': 1600000000000 + i,
+    } for i in range(5000)]}
+    return [
+        ('depth', json.dumps({'success': 1, 'data': depth}).encode(), [('Depth', Depth.from_dict)]),
+        ('transactions', json.dumps({'success': 1, 'data': transactions}).encode(), [
+            ('Trade', Trade.from_transactions),
+            ('Transactions', Transactions.from_dict),
+        ]),
+    ]
+
+
+def make_response(body):
+    response = requests.models.Response()
+    response._content = body
+    response.status_code = 200
+    return response
+
+
+def timed(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n
+
+
+def retained(fn):
+    tracemalloc.start()
+    value = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=50)
+    args = parser.parse_args()
+
+    loads = fastest_json_decoder()
+    print('decoder: %s.%s' % (loads.__module__, loads.__name__))
+    for name, body, models in make_payloads():
+        cases = [
+            ('response.json', lambda: make_response(body).json()['data']),
+            ('bytes decoder', lambda: try_json_parse(make_response(body), logger)['data']),
+        ]
+        for model, to_model in models:
+            cases.append(('+ ' + model, lambda to_model=to_model: to_model(try_json_parse(make_response(body), logger)['data'])))
+        for case, fn in cases:
+            print('%-13s %-15s %8.2f ms %10.1f KiB' % (name, case, timed(fn, args.n) * 1e3, retained(fn) / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Import and first-client start-up cost in fresh interpreters, per transport.
+#
+#   python benchmarks/bench_import.py [-n 20]
+#
+# For a per-module breakdown use: python -X importtime -c "import python_bitbankcc"
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+import argparse, json, os, subprocess, sys
+
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+PROBE = '''
+import sys, time
+start = time.perf_counter()
+%s
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'modules': len(sys.modules), 'requests': 'requests' in sys.modules}))
+'''
+
+CASES = [
+    ('import python_bitbankcc', 'import python_bitbankcc'),
+    ('private(), requests', "import python_bitbankcc; python_bitbankcc.private('k', 's', config={'transport': 'requests'})"),
+    ('private(), urllib3', "import python_bitbankcc; python_bitbankcc.private('k', 's', config={'transport': 'urllib3'})"),
+    ('private(), http.client', "import python_bitbankcc; python_bitbankcc.private('k', 's', config={'transport': 'http.client'})"),
+]
+
+
+def run(code):
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    output = subprocess.check_output([sys.executable, '-c', 'import json\n' + PROBE % code], env=env)
+    return json.loads(output.decode())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=20)
+    args = parser.parse_args()
+
+    for name, code in CASES:
+        runs = [run(code) for _ in range(args.n)]
+        seconds = sorted(r['seconds'] for r in runs)
+        print('%-26s median %7.2f ms  min %7.2f ms  %4d modules  requests loaded: %s' % (
+            name, seconds[len(seconds) // 2] * 1e3, seconds[0] * 1e3, runs[0]['modules'], runs[0]['requests']))
+
+
+if __name__ == '__main__':
+    main()
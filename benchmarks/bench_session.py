@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Compares per-request latency of one-shot requests.get against the pooled
+# session held by bitbankcc_public against the local simulator.
+#
+#   python benchmarks/bench_session.py [-n 500]
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+import argparse, contextlib, os, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import requests
+import python_bitbankcc
+from simulator import Simulator
+
+
+def measure(fn, n):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=500)
+    args = parser.parse_args()
+
+    with Simulator() as sim:
+        url = sim.public_end_point + '/btc_jpy/ticker'
+
+        def one_shot():
+            with contextlib.closing(requests.get(url)) as response:
+                response.json()
+
+        with python_bitbankcc.public(sim.public_end_point) as pub:
+            results = [
+                ('requests.get', measure(one_shot, args.n)),
+                ('pooled session', measure(lambda: pub.get_ticker('btc_jpy'), args.n)),
+            ]
+
+    for name, (p50, p99) in results:
+        print('%-16s p50 %8.1f us  p99 %8.1f us' % (name, p50 * 1e6, p99 * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Signed requests per second of the per-call helpers (make_request_time_header
+# plus two urlencode calls, as _get_query used to do) against the cached
+# RequestSigner used by bitbankcc_private.
+#
+#   python benchmarks/bench_sign.py [-n 200000]
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+import argparse, os, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from python_bitbankcc import private
+from python_bitbankcc.private_api import make_request_time_header, urlencode
+
+
+API_KEY = 'a' * 36
+API_SECRET = 'b' * 64
+PATH = '/user/spot/active_orders?'
+QUERY = {'pair': 'btc_jpy', 'count': 100}
+
+
+def before():
+    data = '/v1' + PATH + urlencode(QUERY)
+    headers = make_request_time_header(data, API_KEY, API_SECRET, 5000)
+    return 'https://api.bitbank.cc/v1' + PATH + urlencode(QUERY), headers
+
+
+def rate(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=200000)
+    args = parser.parse_args()
+
+    client = private(API_KEY, API_SECRET)
+    after = lambda: client._prepare_get('/user/spot/active_orders', QUERY)
+    for name, fn in [('before', before), ('RequestSigner', after)]:
+        print('%-14s %10.0f signed requests/s' % (name, rate(fn, args.n)))
+    client.close()
+
+
+if __name__ == '__main__':
+    main()
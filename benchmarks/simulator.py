@@ -0,0 +1,364 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Local stand-in for public.bitbank.cc and api.bitbank.cc used by the benchmarks.
+# Private requests are authenticated exactly like the real API (request_time and nonce
+# methods, HMAC-SHA256 of the same message), orders are kept in memory, and latency
+# and error codes from ERROR_CODES can be injected.
+#
+#   python benchmarks/simulator.py --port 8080 --latency 0.02 --error-rate 0.01
+#
+# or from Python:
+#
+#   with Simulator(latency=0.005) as sim:
+#       pub = python_bitbankcc.public(sim.public_end_point)
+#       prv = python_bitbankcc.private(sim.api_key, sim.api_secret, config={'end_point': sim.private_end_point})
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+import argparse, hashlib, hmac, itertools, json, os, random, sys, threading, time
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlsplit, parse_qs
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from python_bitbankcc.utils import ERROR_CODES
+
+
+PAIRS = ('btc_jpy', 'xrp_jpy', 'eth_jpy', 'ltc_jpy', 'bcc_jpy', 'mona_jpy')
+
+
+class Failure(Exception):
+    def __init__(self, code):
+        self.code = code
+
+
+def now_ms():
+    return int(time.time() * 1000)
+
+
+def make_depth(pair, levels=200):
+    mid = 5000000 if pair == 'btc_jpy' else 100
+    return {
+        'asks': [[str(mid + i + 1), '%.4f' % (0.01 * (i % 7 + 1))] for i in range(levels)],
+        'bids': [[str(mid - i), '%.4f' % (0.01 * (i % 5 + 1))] for i in range(levels)],
+        'asks_over': '0', 'bids_under': '0', 'asks_under': '0', 'bids_over': '0',
+        'timestamp': now_ms(),
+        'sequenceId': str(now_ms()),
+    }
+
+
+def make_ticker(pair):
+    return {'pair': pair, 'sell': '5000001', 'buy': '5000000', 'open': '4900000', 'high': '5100000',
+            'low': '4800000', 'last': '5000000', 'vol': '123.4567', 'timestamp': now_ms()}
+
+
+class Exchange(object):
+    # in-memory orders and JPY balance of one simulated account
+
+    def __init__(self, jpy='1000000'):
+        self.jpy = jpy
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.orders = {}
+
+    def order(self, body):
+        with self.lock:
+            order_id = next(self.ids)
+            order = {
+                'order_id': order_id, 'pair': body['pair'], 'side': body['side'], 'type': body['type'],
+                'start_amount': str(body['amount']), 'remaining_amount': str(body['amount']),
+                'executed_amount': '0', 'price': body.get('price'), 'post_only': bool(body.get('post_only')),
+                'average_price': '0', 'ordered_at': now_ms(), 'status': 'UNFILLED',
+            }
+            self.orders[order_id] = order
+            return dict(order)
+
+    def get(self, pair, order_id):
+        order = self.orders.get(int(order_id))
+        if order is None or order['pair'] != pair:
+            raise Failure(50009)
+        return order
+
+    def cancel(self, pair, order_id):
+        with self.lock:
+            order = self.get(pair, order_id)
+            if order['status'] == 'CANCELED_UNFILLED':
+                raise Failure(50026)
+            order['status'] = 'CANCELED_UNFILLED'
+            order['canceled_at'] = now_ms()
+            return dict(order)
+
+    def active(self, pair):
+        with self.lock:
+            return [dict(o) for o in self.orders.values() if o['pair'] == pair and o['status'] == 'UNFILLED']
+
+
+class Simulator(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 error_codes=(70011,), api_key='simulator-key', api_secret='simulator-secret'):
+        HTTPServer.__init__(self, (host, port), SimulatorHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_codes = list(error_codes)
+        # path -> code returned on every request to it, e.g. {'/v1/user/spot/order': 60011}
+        self.forced_errors = {}
+        # path -> HTTP status answered instead, e.g. {'/v1/user/assets': 503}
+        self.forced_statuses = {}
+        # paths whose connection is closed once the request is read, without a response
+        self.dropped_paths = set()
+        self.api_key = api_key
+        self.api_secret = api_secret
+        # api_key -> (api_secret, Exchange); add_account registers more
+        self.accounts = {}
+        self.last_nonces = {}
+        self.exchange = self.add_account(api_key, api_secret)
+        self.nonce_lock = threading.Lock()
+        self.requests = 0
+        self.auth_failures = 0
+        self.thread = None
+
+    @property
+    def base(self):
+        return 'http://%s:%d' % self.server_address[:2]
+
+    @property
+    def public_end_point(self):
+        return self.base
+
+    @property
+    def private_end_point(self):
+        return self.base + '/v1'
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def add_account(self, api_key, api_secret, jpy='1000000'):
+        exchange = Exchange(jpy)
+        self.accounts[api_key] = (api_secret, exchange)
+        return exchange
+
+    def check_auth(self, headers, message):
+        api_key = headers.get('ACCESS-KEY')
+        if api_key is None:
+            raise Failure(20003)
+        if api_key not in self.accounts:
+            raise Failure(20002)
+        signature = headers.get('ACCESS-SIGNATURE')
+        if signature is None:
+            raise Failure(20005)
+        request_time = headers.get('ACCESS-REQUEST-TIME')
+        nonce = headers.get('ACCESS-NONCE')
+        if request_time is not None:
+            time_window = headers.get('ACCESS-TIME-WINDOW', '5000')
+            if not request_time.isdigit():
+                raise Failure(20037)
+            if not time_window.isdigit() or not 0 < int(time_window) <= 60000:
+                raise Failure(20038)
+            if int(request_time) > now_ms() + 1000:
+                raise Failure(20034)
+            if now_ms() > int(request_time) + int(time_window):
+                raise Failure(20035)
+            signed = request_time + time_window + message
+        elif nonce is not None:
+            if not nonce.isdigit():
+                raise Failure(20039)
+            with self.nonce_lock:
+                if int(nonce) <= self.last_nonces.get(api_key, 0):
+                    raise Failure(20039)
+                self.last_nonces[api_key] = int(nonce)
+            signed = nonce + message
+        else:
+            raise Failure(20036)
+        expected = hmac.new(self.accounts[api_key][0].encode('utf8'), signed.encode('utf8'), hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(expected, signature):
+            raise Failure(20001)
+
+
+class SimulatorHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.handle_api('GET', None)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.handle_api('POST', self.rfile.read(length).decode('utf8'))
+
+    def handle_api(self, method, body):
+        sim = self.server
+        sim.requests += 1
+        delay = sim.latency + random.uniform(0, sim.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        url = urlsplit(self.path)
+        if url.path in sim.dropped_paths:
+            self.close_connection = True
+            return
+        if url.path in sim.forced_statuses:
+            self.reply({'success': 0, 'data': {'code': 10000}}, sim.forced_statuses[url.path])
+            return
+        try:
+            if url.path in sim.forced_errors:
+                raise Failure(sim.forced_errors[url.path])
+            if sim.error_rate and random.random() < sim.error_rate:
+                raise Failure(random.choice(sim.error_codes))
+            if url.path.startswith('/v1/'):
+                try:
+                    sim.check_auth(self.headers, self.path if method == 'GET' else body)
+                except Failure:
+                    sim.auth_failures += 1
+                    raise
+                query = dict((k, v[0]) for k, v in parse_qs(url.query).items())
+                data = self.private(method, url.path[3:], query, json.loads(body) if body else {})
+            else:
+                data = self.public(url.path.strip('/').split('/'))
+            self.reply({'success': 1, 'data': data})
+        except Failure as e:
+            self.reply({'success': 0, 'data': {'code': e.code}})
+        except (KeyError, ValueError):
+            self.reply({'success': 0, 'data': {'code': 10002}})
+
+    def reply(self, payload, status=200):
+        content = json.dumps(payload).encode('utf8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def public(self, parts):
+        if parts == ['tickers'] or parts == ['tickers_jpy']:
+            return [make_ticker(pair) for pair in PAIRS]
+        if len(parts) < 2 or parts[0] not in PAIRS:
+            raise Failure(10000)
+        pair, kind = parts[0], parts[1]
+        if kind == 'ticker':
+            return make_ticker(pair)
+        if kind == 'depth':
+            return make_depth(pair)
+        if kind == 'transactions':
+            return {'transactions': [{'transaction_id': i, 'side': 'buy' if i % 2 else 'sell', 'price': '5000000',
+                                      'amount': '0.01', 'executed_at': now_ms() - i} for i in range(60)]}
+        if kind == 'candlestick' and len(parts) == 4:
+            return {'candlestick': [{'type': parts[2], 'ohlcv': [
+                ['5000000', '5010000', '4990000', '5005000', '1.2345', now_ms() - i * 60000] for i in range(24)
+            ]}], 'timestamp': now_ms()}
+        if kind == 'circuit_break_info':
+            return {'mode': 'NONE', 'estimated_itayose_price': None, 'estimated_itayose_amount': None,
+                    'itayose_upper_price': None, 'itayose_lower_price': None, 'upper_trigger_price': None,
+                    'lower_trigger_price': None, 'fee_type': 'NORMAL', 'reopen_timestamp': None,
+                    'timestamp': now_ms()}
+        raise Failure(10000)
+
+    def private(self, method, path, query, body):
+        exchange = self.server.accounts[self.headers.get('ACCESS-KEY')][1]
+        if method == 'GET':
+            if path == '/user/assets':
+                return {'assets': [{'asset': 'jpy', 'onhand_amount': exchange.jpy, 'locked_amount': '0',
+                                    'free_amount': exchange.jpy, 'withdrawal_fee': '550'}]}
+            if path == '/user/spot/order':
+                return exchange.get(query['pair'], query['order_id'])
+            if path == '/user/spot/active_orders':
+                return {'orders': exchange.active(query['pair'])}
+            if path == '/user/spot/trade_history':
+                return {'trades': []}
+            if path == '/user/margin/positions':
+                return {'notice': None, 'payables': {'amount': '0'}, 'positions': [], 'losscut_threshold': {}}
+            if path == '/user/deposit_history':
+                return {'deposits': []}
+            if path == '/user/withdrawal_account':
+                return {'accounts': [{'uuid': 'e9fb5d9f-0509-4cb5-8325-ec13ade4354c', 'label': 'sim', 'address': 'x'}]}
+            if path == '/user/withdrawal_history':
+                return {'withdrawals': []}
+            if path == '/user/subscribe':
+                return {'pubnub_channel': 'simulator', 'pubnub_token': 'simulator'}
+        else:
+            if path == '/user/spot/order':
+                return exchange.order(body)
+            if path == '/user/spot/cancel_order':
+                return exchange.cancel(body['pair'], body['order_id'])
+            if path in ('/user/spot/cancel_orders', '/user/spot/orders_info'):
+                if len(body['order_ids']) > 30:
+                    raise Failure(40015)
+                fn = exchange.cancel if path.endswith('cancel_orders') else exchange.get
+                orders = []
+                for order_id in body['order_ids']:
+                    try:
+                        orders.append(dict(fn(body['pair'], order_id)))
+                    except Failure:
+                        pass
+                return {'orders': orders}
+            if path == '/user/request_withdrawal':
+                return {'uuid': body['uuid'], 'asset': body['asset'], 'amount': body['amount'], 'status': 'CONFIRMING'}
+        raise Failure(10000)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='uniform random extra seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-codes', default='70011', help='comma separated codes from ERROR_CODES')
+    args = parser.parse_args()
+    codes = [int(code) for code in args.error_codes.split(',')]
+    unknown = [code for code in codes if str(code) not in ERROR_CODES]
+    if unknown:
+        parser.error('unknown error codes: %s' % unknown)
+    sim = Simulator(args.host, args.port, args.latency, args.jitter, args.error_rate, codes)
+    print('public: %s  private: %s  key: %s  secret: %s' % (
+        sim.public_end_point, sim.private_end_point, sim.api_key, sim.api_secret))
+    try:
+        sim.serve_forever()
+    except KeyboardInterrupt:
+        sim.server_close()
+
+
+if __name__ == '__main__':
+    main()
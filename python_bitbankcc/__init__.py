@@ -23,6 +23,48 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from .public_api import bitbankcc_public as public
-from .private_api import bitbankcc_private as private
-from .utils import BitbankClientError
+import importlib
+
+# the clients and their HTTP backend are imported on first use so that
+# `import python_bitbankcc` stays cheap for short-lived processes
+_exports = {
+    'public': ('.public_api', 'bitbankcc_public'),
+    'private': ('.private_api', 'bitbankcc_private'),
+    'private_pool': ('.pool', 'bitbankcc_private_pool'),
+    'BitbankClientError': ('.utils', 'BitbankClientError'),
+    'set_json_decoder': ('.utils', 'set_json_decoder'),
+    'RateLimiter': ('.ratelimit', 'RateLimiter'),
+    'RetryPolicy': ('.retry', 'RetryPolicy'),
+    'TTLCache': ('.cache', 'TTLCache'),
+    'LatencyHistogram': ('.metrics', 'LatencyHistogram'),
+    'OrderBook': ('.orderbook', 'OrderBook'),
+    'Ticker': ('.models', 'Ticker'),
+    'Depth': ('.models', 'Depth'),
+    'Trade': ('.models', 'Trade'),
+    'Transactions': ('.models', 'Transactions'),
+    'Order': ('.models', 'Order'),
+    'PublicStream': ('.stream', 'PublicStream'),
+    'PrivateStream': ('.stream', 'PrivateStream'),
+    'public_rooms': ('.stream', 'public_rooms'),
+    'OrderTracker': ('.orders', 'OrderTracker'),
+    'HistoryDownloader': ('.downloader', 'HistoryDownloader'),
+    'async_public': ('.async_api', 'bitbankcc_async_public'),
+    'async_private': ('.async_api', 'bitbankcc_async_private'),
+    'RequestsTransport': ('.transport', 'RequestsTransport'),
+    'Urllib3Transport': ('.transport', 'Urllib3Transport'),
+    'HttpClientTransport': ('.transport', 'HttpClientTransport'),
+}
+
+__all__ = sorted(_exports)
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    module, attr = _exports[name]
+    value = getattr(importlib.import_module(module, __name__), attr)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+from .public_api import bitbankcc_public
+from .private_api import bitbankcc_private, default_config
+from .utils import BitbankClientError, error_parser, try_json_loads
+from .retry import is_idempotent
+from .pagination import PageWalker, MAX_PAGE_SIZE, MAX_TRANSFER_PAGE_SIZE
+from .batch import chunk_by_pair, match_chunk_results, MAX_CONCURRENT_ORDERS, MAX_ORDER_IDS
+from .clock import now_ms
+from .metrics import RequestEvent, notify
+from logging import getLogger
+from time import perf_counter
+import asyncio
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+logger = getLogger(__name__)
+
+DEFAULT_ASYNC_POOL_SIZE = 100
+
+# default_config of the sync client with an asyncio sized connection limit
+async_default_config = dict(default_config, pool_size=DEFAULT_ASYNC_POOL_SIZE)
+
+
+def make_client_timeout(timeout):
+    if isinstance(timeout, (tuple, list)):
+        return aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+    return aiohttp.ClientTimeout(total=timeout)
+
+def make_async_session(config):
+    # aiohttp sessions must be created inside a running loop, so clients call this lazily.
+    return aiohttp.ClientSession(connector=aiohttp.TCPConnector(
+        limit=config.get('pool_size', DEFAULT_ASYNC_POOL_SIZE)
+    ))
+
+async def perform_async(client, method, endpoint, prepare, send):
+    # asyncio counterpart of session.perform
+    event = RequestEvent(method, endpoint) if client.observers else None
+    started = perf_counter()
+    if client.rate_limiter is not None:
+        await client.rate_limiter.acquire_async(method, endpoint)
+    queued = perf_counter()
+    args = prepare()
+    sent_at = now_ms()
+    signed = perf_counter()
+    try:
+        async with send(*args) as response:
+            headers_received = perf_counter()
+            if client.clock is not None:
+                client.clock.observe_response(sent_at, response)
+            response.raise_for_status()
+            body = await response.read()
+            received = perf_counter()
+            if event is not None:
+                event.status = response.status
+                event.bytes_received = len(body)
+                event.wait_time = headers_received - signed
+                event.read_time = received - headers_received
+            result = try_json_loads(body, logger)
+            if event is not None:
+                event.decode_time = perf_counter() - received
+            return error_parser(result)
+    except Exception as e:
+        if event is not None:
+            event.error = e
+            event.error_code = getattr(e, 'code', None)
+            event.status = getattr(e, 'status', event.status)
+        raise
+    finally:
+        if event is not None:
+            event.queue_time = queued - started
+            event.sign_time = signed - queued
+            event.total_time = perf_counter() - started
+            notify(client.observers, event)
+
+
+async def run_batch_async(calls, max_workers):
+    # asyncio counterpart of batch.run_batch: at most max_workers coroutines in flight,
+    # results in input order and a failed item returned as its BitbankClientError
+    semaphore = asyncio.Semaphore(max_workers)
+    async def call_safely(fn, args):
+        async with semaphore:
+            try:
+                return await fn(*args)
+            except BitbankClientError as e:
+                return e
+            except Exception as e:
+                return BitbankClientError(repr(e))
+    return list(await asyncio.gather(*[call_safely(fn, args) for fn, args in calls]))
+
+async def run_chunked_by_pair_async(fn, orders, chunk_size, max_workers):
+    chunks = chunk_by_pair(orders, chunk_size)
+    return match_chunk_results(orders, chunks, await run_batch_async([(fn, chunk) for chunk in chunks], max_workers))
+
+async def iter_history_async(fetch, id_key, time_key, since=None, end=None, count=MAX_PAGE_SIZE, prefetch=False):
+    # async generator over fetch(since, end, count) -> awaitable list of records
+    walker = PageWalker(id_key, time_key, count)
+    task = None
+    try:
+        page = await fetch(since, end, count)
+        while page:
+            if prefetch and walker.is_full(page):
+                task = asyncio.ensure_future(fetch(walker.next_since(page), end, count))
+            for record in walker.new_records(page):
+                yield record
+            if not walker.is_full(page):
+                return
+            page = await task if task is not None else await fetch(walker.next_since(page), end, count)
+            task = None
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+class async_session_mixin(object):
+    # shared lifecycle of the asyncio clients; the endpoint methods are inherited
+    # from the sync classes and return the coroutines of the overridden _query methods.
+
+    def _configure(self, config):
+        if aiohttp is None:
+            raise ImportError('aiohttp is required for the asyncio clients: pip install aiohttp')
+        self._session_config = config
+        self.pool_size = config.get('pool_size', DEFAULT_ASYNC_POOL_SIZE)
+        self._client_timeout = make_client_timeout(self.timeout)
+
+    def _make_session(self, config):
+        self._configure(config)
+        return None
+
+    def _adopt_session(self, session, config):
+        # a caller supplied aiohttp.ClientSession is used as is
+        self._configure(config)
+        return session
+
+    def _get_session(self):
+        if self.session is None:
+            self.session = make_async_session(self._session_config)
+        return self.session
+
+    async def close(self):
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def __enter__(self):
+        raise TypeError('use "async with" for the asyncio clients')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+class bitbankcc_async_public(async_session_mixin, bitbankcc_public):
+
+    async def _query(self, query_url):
+        if self.retry_policy is None:
+            return await self._send(query_url)
+        return await self.retry_policy.call_async(lambda: self._send(query_url))
+
+    async def _send(self, query_url):
+        return await perform_async(self, 'GET', query_url[len(self.end_point):], lambda: (query_url,),
+                                   lambda uri: self._get_session().get(uri, timeout=self._client_timeout))
+
+    async def batch(self, calls, max_workers=None):
+        return await run_batch_async([(getattr(self, name), tuple(args)) for name, args in calls],
+                                     max_workers or self.pool_size)
+
+    async def batch_by_pair(self, method_name, pairs, *args, **kwargs):
+        results = await self.batch([(method_name, (pair,) + args) for pair in pairs], **kwargs)
+        return dict(zip(pairs, results))
+
+
+class bitbankcc_async_private(async_session_mixin, bitbankcc_private):
+
+    def __init__(self, api_key, api_secret, end_point='https://api.bitbank.cc/v1', config=async_default_config,
+                 session=None, rate_limiter=None):
+        super(bitbankcc_async_private, self).__init__(api_key, api_secret, end_point, config, session, rate_limiter)
+
+    async def _request(self, method, path, send):
+        if self.retry_policy is None:
+            return await send()
+        return await self.retry_policy.call_async(send, is_idempotent(method, path))
+
+    async def _get_query(self, path, query):
+        return await self._request('GET', path, lambda: self._send_get(path, query))
+
+    async def _post_query(self, path, query):
+        return await self._request('POST', path, lambda: self._send_post(path, query))
+
+    async def _send_get(self, path, query):
+        return await perform_async(self, 'GET', path, lambda: self._prepare_get(path, query),
+                                   lambda uri, headers: self._get_session().get(
+                                       uri, headers=headers, timeout=self._client_timeout))
+
+    async def _send_post(self, path, query):
+        return await perform_async(self, 'POST', path, lambda: self._prepare_post(path, query),
+                                   lambda uri, data, headers: self._get_session().post(
+                                       uri, data=data, headers=headers, timeout=self._client_timeout))
+
+    async def order_many(self, orders, max_workers=None):
+        max_workers = min(max_workers or self.pool_size, MAX_CONCURRENT_ORDERS)
+        return await run_batch_async([(self._order_from_spec, (spec,)) for spec in orders], max_workers)
+
+    async def cancel_orders_many(self, orders, chunk_size=MAX_ORDER_IDS, max_workers=None):
+        return await run_chunked_by_pair_async(self.cancel_orders, orders, chunk_size, max_workers or self.pool_size)
+
+    async def get_orders_info_many(self, orders, chunk_size=MAX_ORDER_IDS, max_workers=None):
+        return await run_chunked_by_pair_async(self.get_orders_info, orders, chunk_size, max_workers or self.pool_size)
+
+    # async generators: use "async for"
+
+    def iter_trade_history(self, pair, since=None, end=None, count=MAX_PAGE_SIZE, prefetch=False):
+        async def fetch(since, end, count):
+            return (await self.get_trade_history(pair, count, since=since, end=end, order='asc'))['trades']
+        return iter_history_async(fetch, 'trade_id', 'executed_at', since, end, count, prefetch)
+
+    def iter_deposit_history(self, asset=None, since=None, end=None, count=MAX_TRANSFER_PAGE_SIZE, prefetch=False):
+        async def fetch(since, end, count):
+            return (await self.get_deposit_history(asset, count, since, end, 'asc'))['deposits']
+        return iter_history_async(fetch, 'uuid', 'found_at', since, end, count, prefetch)
+
+    def iter_withdraw_history(self, asset=None, since=None, end=None, count=MAX_TRANSFER_PAGE_SIZE, prefetch=False):
+        async def fetch(since, end, count):
+            return (await self.get_withdraw_history(asset, count, since, end, 'asc'))['withdrawals']
+        return iter_history_async(fetch, 'uuid', 'requested_at', since, end, count, prefetch)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+from .utils import BitbankClientError
+from collections import OrderedDict
+
+
+# server side limits: orders in flight per account (60011) and ids per cancel_orders/orders_info (40015)
+MAX_CONCURRENT_ORDERS = 30
+MAX_ORDER_IDS = 30
+
+
+def call_safely(fn, args):
+    try:
+        return fn(*args)
+    except BitbankClientError as e:
+        return e
+    except Exception as e:
+        return BitbankClientError(repr(e))
+
+def run_batch(calls, max_workers):
+    # calls is a list of (callable, args); results come back in input order and
+    # a failed item is returned as its BitbankClientError instead of aborting the batch.
+    from concurrent.futures import ThreadPoolExecutor
+    calls = list(calls)
+    if len(calls) == 0:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as executor:
+        return list(executor.map(lambda call: call_safely(call[0], call[1]), calls))
+
+def chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def chunk_by_pair(orders, chunk_size):
+    # orders is a list of (pair, order_id); returns [(pair, ids)] with at most chunk_size ids each
+    by_pair = OrderedDict()
+    for pair, order_id in orders:
+        by_pair.setdefault(pair, []).append(order_id)
+    return [(pair, ids) for pair, pair_ids in by_pair.items() for ids in chunked(pair_ids, chunk_size)]
+
+def match_chunk_results(orders, chunks, results):
+    # maps the {'orders': [...]} result of every chunk back onto the input list, with the order dict,
+    # the chunk's BitbankClientError, or None when the server left it out
+    found = {}
+    for (pair, ids), result in zip(chunks, results):
+        if isinstance(result, BitbankClientError):
+            for order_id in ids:
+                found[(pair, str(order_id))] = result
+        else:
+            for order in result['orders']:
+                found[(pair, str(order['order_id']))] = order
+    return [found.get((pair, str(order_id))) for pair, order_id in orders]
+
+def run_chunked_by_pair(fn, orders, chunk_size, max_workers):
+    # ids are grouped per pair and sent as chunks of chunk_size through fn(pair, ids); the result
+    # list follows the input (see match_chunk_results)
+    chunks = chunk_by_pair(orders, chunk_size)
+    return match_chunk_results(orders, chunks, run_batch([(fn, chunk) for chunk in chunks], max_workers))
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+from .utils import BitbankClientError
+from collections import OrderedDict
+import threading, time
+
+
+# TTLs in seconds keyed by path suffix; only endpoints listed here are cached
+DEFAULT_TTLS = {
+    '/tickers_jpy': 1,
+    '/circuit_break_info': 5,
+    '/user/assets': 1,
+    '/user/withdrawal_account': 300,
+}
+
+# private POST paths and the cached path prefixes whose data they change
+INVALIDATED_BY = {
+    '/user/spot/order': ('/user/assets', '/user/spot/active_orders', '/user/spot/order'),
+    '/user/spot/cancel_order': ('/user/assets', '/user/spot/active_orders', '/user/spot/order'),
+    '/user/spot/cancel_orders': ('/user/assets', '/user/spot/active_orders', '/user/spot/order'),
+    '/user/request_withdrawal': ('/user/assets', '/user/withdrawal_history'),
+}
+
+
+class InFlight(object):
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class TTLCache(object):
+    # LRU bounded by max_entries. concurrent misses on the same key share a single request.
+    # results are returned as is, so callers must not mutate them.
+
+    def __init__(self, ttls=None, max_entries=256):
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.inflight = {}
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def ttl_for(self, path):
+        for suffix, ttl in self.ttls.items():
+            if path.endswith(suffix):
+                return ttl
+        return None
+
+    def get(self, path, key, fetch):
+        ttl = self.ttl_for(path)
+        if ttl is None:
+            return fetch()
+        key = (path, key)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            waiting = self.inflight.get(key)
+            if waiting is None:
+                waiting = self.inflight[key] = InFlight()
+                owner = True
+                generation = self.generation
+            else:
+                owner = False
+        if not owner:
+            waiting.done.wait()
+            if waiting.error is not None:
+                raise waiting.error
+            return waiting.result
+        try:
+            waiting.result = fetch()
+        except Exception as e:
+            waiting.error = e
+            raise
+        except BaseException as e:
+            # e.g. KeyboardInterrupt in the owner; the waiters get an error, never a missing result
+            waiting.error = BitbankClientError('shared request interrupted: %r' % e)
+            raise
+        finally:
+            with self.lock:
+                del self.inflight[key]
+                # a result fetched across an invalidation may predate the change, do not keep it
+                if waiting.error is None and generation == self.generation:
+                    self.entries[key] = (time.monotonic() + ttl, waiting.result)
+                    self.entries.move_to_end(key)
+                    while len(self.entries) > self.max_entries:
+                        self.entries.popitem(last=False)
+            waiting.done.set()
+        return waiting.result
+
+    def invalidate(self, prefixes=None):
+        # drops the entries whose path starts with one of prefixes, or everything
+        with self.lock:
+            self.generation += 1
+            for key in list(self.entries):
+                if prefixes is None or key[0].startswith(tuple(prefixes)):
+                    del self.entries[key]
+
+    def invalidate_after(self, post_path):
+        if post_path in INVALIDATED_BY:
+            self.invalidate(INVALIDATED_BY[post_path])
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+import os, threading, time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def now_ms():
+    return time.time() * 1000
+
+
+class ServerClock(object):
+    # estimates server time - local time in milliseconds from HTTP Date headers.
+    # a Date of D seconds seen on a request sent at s and answered at r (local ms) means
+    #   D * 1000 - r <= offset < D * 1000 + 1000 - s
+    # the bounds of successive responses are intersected, which narrows the one second resolution
+    # of the header down to the jitter of the round trips. the window restarts after max_age
+    # seconds so local clock drift is followed. the correction applied is the smallest one that
+    # the bounds allow, so a local clock that is already right is left untouched.
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.lower = None
+        self.upper = None
+        self.window_started = None
+        self.offset = 0
+        self.rtt = None
+        self.min_rtt = None
+        self.samples = 0
+
+    def observe(self, sent_at, received_at, date_header):
+        # sent_at and received_at are local now_ms() values around the request
+        if not date_header:
+            return
+        from email.utils import parsedate_tz, mktime_tz
+        parsed = parsedate_tz(date_header)
+        if parsed is None:
+            return
+        server_ms = mktime_tz(parsed) * 1000
+        lower = server_ms - received_at
+        upper = server_ms + 1000 - sent_at
+        rtt = received_at - sent_at
+        with self.lock:
+            self.samples += 1
+            self.rtt = rtt if self.rtt is None else self.rtt * 0.8 + rtt * 0.2
+            self.min_rtt = rtt if self.min_rtt is None else min(self.min_rtt, rtt)
+            expired = self.window_started is None or received_at - self.window_started > self.max_age * 1000
+            if expired or lower > self.upper or upper < self.lower:
+                self.lower, self.upper, self.window_started = lower, upper, received_at
+            else:
+                self.lower = max(self.lower, lower)
+                self.upper = min(self.upper, upper)
+            if self.lower > 0:
+                self.offset = self.lower
+            elif self.upper < 0:
+                self.offset = self.upper
+            else:
+                self.offset = 0
+
+    def observe_response(self, sent_at, response):
+        self.observe(sent_at, now_ms(), response.headers.get('Date'))
+
+    @property
+    def bounds(self):
+        return self.lower, self.upper
+
+    def now_ms(self):
+        return now_ms() + self.offset
+
+    def sync(self, session, url, samples=5, timeout=10):
+        # session is a client's transport (client.session) or a requests.Session
+        # cheap requests (e.g. the public end point) to seed the estimate before the first order
+        for _ in range(samples):
+            sent_at = now_ms()
+            response = session.head(url, timeout=timeout)
+            self.observe_response(sent_at, response)
+            response.close()
+        return self.offset
+
+
+class NonceGenerator(object):
+    # strictly increasing millisecond stamps. with path, the last value is shared through a
+    # locked file so that several processes using the same API key never reuse a nonce.
+
+    def __init__(self, clock=None, path=None):
+        self.clock = clock
+        self.path = path if fcntl is not None else None
+        self.lock = threading.Lock()
+        self.last = 0
+
+    def next(self):
+        stamp = int(self.clock.now_ms() if self.clock is not None else now_ms())
+        with self.lock:
+            if self.path is not None:
+                return self._next_shared(stamp)
+            self.last = max(stamp, self.last + 1)
+            return self.last
+
+    def _next_shared(self, stamp):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            last = os.read(fd, 32)
+            last = int(last) if last.strip() else 0
+            self.last = max(stamp, last + 1, self.last + 1)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, str(self.last).encode('ascii'))
+            return self.last
+        finally:
+            os.close(fd)
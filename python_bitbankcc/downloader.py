@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+from concurrent.futures import ThreadPoolExecutor
+from array import array
+import datetime, os, sys, time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# candle types served per day (YYYYMMDD) and per year (YYYY) by get_candlestick
+DAILY_CANDLE_TYPES = ('1min', '5min', '15min', '30min', '1hour')
+YEARLY_CANDLE_TYPES = ('4hour', '8hour', '12hour', '1day', '1week', '1month')
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume', 'timestamp')
+TRANSACTION_COLUMNS = ('transaction_id', 'side', 'price', 'amount', 'executed_at')
+
+SIDES = {'buy': 1.0, 'sell': -1.0}
+
+
+def to_date(value):
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.datetime.strptime(value, '%Y%m%d').date()
+
+def daily_periods(start, end):
+    day = to_date(start)
+    end = to_date(end)
+    while day <= end:
+        yield day.strftime('%Y%m%d')
+        day += datetime.timedelta(days=1)
+
+def yearly_periods(start, end):
+    for year in range(to_date(start).year, to_date(end).year + 1):
+        yield str(year)
+
+def is_mutable(period):
+    # UTC is never ahead of JST, so a period ending before today in UTC is complete whichever
+    # timezone the server cuts days in
+    today = datetime.date(*time.gmtime()[:3])
+    if len(period) == 4:
+        return int(period) >= today.year
+    return period >= today.strftime('%Y%m%d')
+
+def ohlcv_rows(result):
+    for candle in result['candlestick']:
+        for row in candle['ohlcv']:
+            yield [float(value) for value in row]
+
+def transaction_rows(result):
+    for t in result['transactions']:
+        yield [float(t['transaction_id']), SIDES[t['side']], float(t['price']), float(t['amount']), float(t['executed_at'])]
+
+
+class HistoryDownloader(object):
+    # caches each fetched period as raw little-endian float64 rows (OHLCV_COLUMNS or
+    # TRANSACTION_COLUMNS) under cache_dir; finished periods are never requested again and the
+    # current one is refetched on each call. results are numpy arrays of shape (n, columns) when
+    # numpy is installed, otherwise flat array('d').
+
+    def __init__(self, public_client, cache_dir, max_workers=8):
+        self.client = public_client
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+
+    def candlestick(self, pair, candle_type, start, end):
+        return self.load(self.candlestick_paths(pair, candle_type, start, end), len(OHLCV_COLUMNS))
+
+    def transactions(self, pair, start, end):
+        return self.load(self.transactions_paths(pair, start, end), len(TRANSACTION_COLUMNS))
+
+    def candlestick_paths(self, pair, candle_type, start, end):
+        periods = yearly_periods(start, end) if candle_type in YEARLY_CANDLE_TYPES else daily_periods(start, end)
+        fetch = lambda period: ohlcv_rows(self.client.get_candlestick(pair, candle_type, period))
+        return self._sync(os.path.join('candlestick', pair, candle_type), periods, fetch)
+
+    def transactions_paths(self, pair, start, end):
+        fetch = lambda period: transaction_rows(self.client.get_transactions(pair, period))
+        return self._sync(os.path.join('transactions', pair), daily_periods(start, end), fetch)
+
+    def _sync(self, directory, periods, fetch):
+        # downloads the missing or mutable periods in parallel and returns every period's file
+        directory = os.path.join(self.cache_dir, directory)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        paths = []
+        missing = []
+        for period in periods:
+            path = os.path.join(directory, period + '.f8')
+            paths.append(path)
+            if is_mutable(period) or not os.path.exists(path):
+                missing.append((period, path))
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                list(executor.map(lambda item: self._store(item[1], fetch(item[0])), missing))
+        return paths
+
+    def _store(self, path, rows):
+        values = array('d')
+        for row in rows:
+            values.extend(row)
+        if sys.byteorder != 'little':
+            values.byteswap()
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            values.tofile(f)
+        os.replace(tmp_path, path)
+
+    def load(self, paths, columns):
+        if numpy is not None:
+            arrays = [numpy.fromfile(path, dtype='<f8') for path in paths]
+            values = numpy.concatenate(arrays) if arrays else numpy.empty(0, dtype='<f8')
+            return values.reshape(-1, columns)
+        values = array('d')
+        for path in paths:
+            with open(path, 'rb') as f:
+                values.frombytes(f.read())
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return values
+
+    def memmap(self, path, columns):
+        # zero-copy view of a single cached period, requires numpy
+        if numpy is None:
+            raise ImportError('numpy is required for HistoryDownloader.memmap: pip install numpy')
+        if os.path.getsize(path) == 0:
+            return numpy.empty((0, columns), dtype='<f8')
+        return numpy.memmap(path, dtype='<f8', mode='r').reshape(-1, columns)
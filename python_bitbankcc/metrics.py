@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+from logging import getLogger
+import math, threading
+
+
+logger = getLogger(__name__)
+
+
+class RequestEvent(object):
+    # one API call as seen by the client, times in seconds:
+    #   queue_time   waiting for a rate limiter token
+    #   sign_time    building the URL, body and signature
+    #   wait_time    request sent until the response headers arrived, including the
+    #                TCP/TLS connect when the pool had no idle connection
+    #   read_time    receiving the body
+    #   decode_time  JSON decoding
+    #   total_time   all of the above
+    __slots__ = ('method', 'endpoint', 'status', 'error_code', 'bytes_received', 'queue_time', 'sign_time',
+                 'wait_time', 'read_time', 'decode_time', 'total_time', 'error')
+
+    def __init__(self, method, endpoint):
+        self.method = method
+        self.endpoint = endpoint
+        self.status = None
+        self.error_code = None
+        self.bytes_received = 0
+        self.queue_time = 0.0
+        self.sign_time = 0.0
+        self.wait_time = 0.0
+        self.read_time = 0.0
+        self.decode_time = 0.0
+        self.total_time = 0.0
+        self.error = None
+
+    def __repr__(self):
+        return 'RequestEvent(%s)' % ', '.join('%s=%r' % (name, getattr(self, name)) for name in self.__slots__)
+
+
+def notify(observers, event):
+    for observer in observers:
+        try:
+            observer(event)
+        except Exception:
+            logger.exception('request observer failed')
+
+
+class LatencyHistogram(object):
+    # in-memory observer: log-scaled buckets (5% wide) of total_time per 'METHOD endpoint', so that
+    # placing an order ('POST /user/spot/order') and querying one ('GET /user/spot/order') stay apart.
+    # add it with client.add_observer(histogram) and read snapshot() from a scraper.
+
+    GROWTH = 1.05
+    MIN_SECONDS = 1e-5
+
+    def __init__(self, field='total_time'):
+        self.field = field
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def __call__(self, event):
+        seconds = max(getattr(event, self.field), self.MIN_SECONDS)
+        bucket = int(math.log(seconds / self.MIN_SECONDS) / math.log(self.GROWTH))
+        key = event.method + ' ' + event.endpoint
+        with self.lock:
+            stats = self.endpoints.get(key)
+            if stats is None:
+                stats = self.endpoints[key] = {'count': 0, 'errors': 0, 'sum': 0.0, 'max': 0.0, 'buckets': {}}
+            stats['count'] += 1
+            stats['sum'] += seconds
+            stats['max'] = max(stats['max'], seconds)
+            stats['buckets'][bucket] = stats['buckets'].get(bucket, 0) + 1
+            if event.error is not None:
+                stats['errors'] += 1
+
+    def _quantile(self, stats, q):
+        rank = q * stats['count']
+        seen = 0
+        for bucket in sorted(stats['buckets']):
+            seen += stats['buckets'][bucket]
+            if seen >= rank:
+                # upper edge of the bucket, capped by the largest observed value
+                return min(self.MIN_SECONDS * self.GROWTH ** (bucket + 1), stats['max'])
+        return stats['max']
+
+    def quantile(self, key, q):
+        # key is e.g. 'GET /user/assets'
+        with self.lock:
+            stats = self.endpoints.get(key)
+            return None if stats is None else self._quantile(stats, q)
+
+    def snapshot(self):
+        with self.lock:
+            return dict((key, {
+                'count': stats['count'],
+                'errors': stats['errors'],
+                'mean': stats['sum'] / stats['count'],
+                'p50': self._quantile(stats, 0.5),
+                'p99': self._quantile(stats, 0.99),
+                'max': stats['max'],
+            }) for key, stats in self.endpoints.items())
+
+    def reset(self):
+        with self.lock:
+            self.endpoints = {}
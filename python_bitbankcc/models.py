@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+from decimal import Decimal
+from array import array
+
+
+def to_decimal(value):
+    return None if value is None else Decimal(value)
+
+
+class Model(object):
+    # compact records built from API dicts; DECIMAL_FIELDS are parsed once, the rest kept as is
+    __slots__ = ()
+    FIELDS = ()
+    DECIMAL_FIELDS = frozenset()
+
+    def __init__(self, **kwargs):
+        for name in self.FIELDS:
+            setattr(self, name, kwargs.get(name))
+
+    @classmethod
+    def from_dict(cls, d, values=None):
+        # values: optional {(is_decimal, str): value} shared across records, so that repeated prices,
+        # amounts, sides and statuses are held once; a Decimal is about twice the size of its string
+        record = cls.__new__(cls)
+        for name in cls.FIELDS:
+            value = d.get(name)
+            is_decimal = name in cls.DECIMAL_FIELDS
+            if values is not None and isinstance(value, type(u'')):
+                key = (is_decimal, value)
+                shared = values.get(key)
+                if shared is None:
+                    shared = values[key] = to_decimal(value) if is_decimal else value
+                value = shared
+            elif is_decimal:
+                value = to_decimal(value)
+            setattr(record, name, value)
+        return record
+
+    @classmethod
+    def from_list(cls, items):
+        values = {}
+        return [cls.from_dict(d, values) for d in items]
+
+    def to_dict(self):
+        return dict((name, getattr(self, name)) for name in self.FIELDS)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, ', '.join('%s=%r' % item for item in self.to_dict().items()))
+
+
+class Ticker(Model):
+    FIELDS = ('pair', 'sell', 'buy', 'open', 'high', 'low', 'last', 'vol', 'timestamp')
+    DECIMAL_FIELDS = frozenset(('sell', 'buy', 'open', 'high', 'low', 'last', 'vol'))
+    __slots__ = FIELDS
+
+
+class Trade(Model):
+    # an entry of get_transactions
+    FIELDS = ('transaction_id', 'side', 'price', 'amount', 'executed_at')
+    DECIMAL_FIELDS = frozenset(('price', 'amount'))
+    __slots__ = FIELDS
+
+    @classmethod
+    def from_transactions(cls, result):
+        return cls.from_list(result['transactions'])
+
+
+class Order(Model):
+    FIELDS = ('order_id', 'pair', 'side', 'position_side', 'type', 'start_amount', 'remaining_amount',
+              'executed_amount', 'price', 'post_only', 'user_cancelable', 'average_price', 'ordered_at',
+              'expire_at', 'canceled_at', 'triggered_at', 'trigger_price', 'status')
+    DECIMAL_FIELDS = frozenset(('start_amount', 'remaining_amount', 'executed_amount', 'price',
+                                'average_price', 'trigger_price'))
+    __slots__ = FIELDS
+
+    @classmethod
+    def from_orders(cls, result):
+        # result of get_active_orders, cancel_orders or get_orders_info
+        return cls.from_list(result['orders'])
+
+
+def to_scaled(values):
+    # decimal strings to (array('q') of integers, scale) with value = integer / 10 ** scale, exactly
+    decimals = [len(value) - value.index('.') - 1 if '.' in value else 0 for value in values]
+    scale = max(decimals) if decimals else 0
+    powers = [10 ** (scale - n) for n in range(scale + 1)]
+    return array('q', [int(value.replace('.', '')) * powers[n] for value, n in zip(values, decimals)]), scale
+
+def from_scaled(value, scale):
+    return Decimal(value).scaleb(-scale)
+
+
+class Depth(object):
+    # get_depth as four arrays of scaled integers, best level first; prices are
+    # ask_prices[i] / 10 ** price_scale, amounts likewise with amount_scale
+    __slots__ = ('ask_prices', 'ask_amounts', 'bid_prices', 'bid_amounts', 'price_scale', 'amount_scale',
+                 'timestamp', 'sequence_id')
+
+    def __init__(self, ask_prices, ask_amounts, bid_prices, bid_amounts, price_scale=0, amount_scale=0,
+                 timestamp=None, sequence_id=None):
+        self.ask_prices = ask_prices
+        self.ask_amounts = ask_amounts
+        self.bid_prices = bid_prices
+        self.bid_amounts = bid_amounts
+        self.price_scale = price_scale
+        self.amount_scale = amount_scale
+        self.timestamp = timestamp
+        self.sequence_id = sequence_id
+
+    @classmethod
+    def from_dict(cls, d):
+        asks = d['asks']
+        bids = d['bids']
+        prices, price_scale = to_scaled([level[0] for level in asks] + [level[0] for level in bids])
+        amounts, amount_scale = to_scaled([level[1] for level in asks] + [level[1] for level in bids])
+        n = len(asks)
+        sequence_id = d.get('sequenceId')
+        return cls(prices[:n], amounts[:n], prices[n:], amounts[n:], price_scale, amount_scale,
+                   d.get('timestamp'), None if sequence_id is None else int(sequence_id))
+
+    def ask(self, i):
+        # (price, amount) of the i-th best ask as Decimals
+        return (from_scaled(self.ask_prices[i], self.price_scale),
+                from_scaled(self.ask_amounts[i], self.amount_scale))
+
+    def bid(self, i):
+        return (from_scaled(self.bid_prices[i], self.price_scale),
+                from_scaled(self.bid_amounts[i], self.amount_scale))
+
+    def __len__(self):
+        return len(self.ask_prices) + len(self.bid_prices)
+
+
+class Transactions(object):
+    # get_transactions as columns; side is 1 for buy and -1 for sell, prices and amounts are
+    # scaled integers as in Depth
+    __slots__ = ('transaction_ids', 'sides', 'prices', 'amounts', 'executed_at', 'price_scale', 'amount_scale')
+
+    def __init__(self, transaction_ids, sides, prices, amounts, executed_at, price_scale=0, amount_scale=0):
+        self.transaction_ids = transaction_ids
+        self.sides = sides
+        self.prices = prices
+        self.amounts = amounts
+        self.executed_at = executed_at
+        self.price_scale = price_scale
+        self.amount_scale = amount_scale
+
+    @classmethod
+    def from_dict(cls, d):
+        transactions = d['transactions']
+        prices, price_scale = to_scaled([t['price'] for t in transactions])
+        amounts, amount_scale = to_scaled([t['amount'] for t in transactions])
+        return cls(
+            array('q', [t['transaction_id'] for t in transactions]),
+            array('b', [1 if t['side'] == 'buy' else -1 for t in transactions]),
+            prices,
+            amounts,
+            array('q', [t['executed_at'] for t in transactions]),
+            price_scale,
+            amount_scale
+        )
+
+    def __getitem__(self, i):
+        return Trade(transaction_id=self.transaction_ids[i], side='buy' if self.sides[i] > 0 else 'sell',
+                     price=from_scaled(self.prices[i], self.price_scale),
+                     amount=from_scaled(self.amounts[i], self.amount_scale),
+                     executed_at=self.executed_at[i])
+
+    def __len__(self):
+        return len(self.transaction_ids)
@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR
+import bisect
+
+
+ZERO = Decimal(0)
+MIN_TREE_SIZE = 1 << 10
+
+
+class FenwickTree(object):
+    # sparse binary indexed tree over the integer keys [0, size); only touched nodes are stored.
+    # size is a power of two so that lower_bound can descend bit by bit.
+
+    def __init__(self, size):
+        self.size = size
+        self.nodes = {}
+
+    def add(self, key, delta):
+        i = key + 1
+        nodes = self.nodes
+        while i <= self.size:
+            nodes[i] = nodes.get(i, ZERO) + delta
+            i += i & -i
+
+    def prefix(self, key):
+        # sum of the keys <= key
+        total = ZERO
+        i = min(key + 1, self.size)
+        nodes = self.nodes
+        while i > 0:
+            total += nodes.get(i, ZERO)
+            i -= i & -i
+        return total
+
+
+class BookSide(object):
+    # price levels kept in a sorted array of Decimal prices plus a price -> amount dict, and in two
+    # Fenwick trees (amount and price * amount) indexed by the distance in ticks from the best side
+    # of an origin, so cumulative depth and VWAP stay O(log n) while diffs are applied.
+    # ticks are the smallest decimal step seen; the trees are rebuilt when a price falls outside
+    # the indexed range or has a finer step, which is rare once the book is loaded.
+
+    def __init__(self, descending):
+        self.descending = descending
+        self.clear()
+
+    def clear(self):
+        self.prices = []
+        self.amounts = {}
+        self.total_amount = ZERO
+        self.total_notional = ZERO
+        self._scale = 0
+        self._origin = None
+        self._amount_tree = FenwickTree(MIN_TREE_SIZE)
+        self._notional_tree = FenwickTree(MIN_TREE_SIZE)
+        self._key_prices = {}
+
+    def _ticks(self, price):
+        return int(price.scaleb(self._scale))
+
+    def _key(self, ticks):
+        # best prices get the lowest keys
+        return self._origin - ticks if self.descending else ticks - self._origin
+
+    def _index(self, price):
+        # key of price, rebuilding the trees when it does not fit
+        if -price.as_tuple().exponent > self._scale or self._origin is None:
+            self._rebuild(price)
+        else:
+            key = self._key(self._ticks(price))
+            if 0 <= key < self._amount_tree.size:
+                return key
+            self._rebuild(price)
+        return self._key(self._ticks(price))
+
+    def _rebuild(self, extra_price):
+        prices = self.prices + [extra_price]
+        self._scale = max(self._scale, max(-p.as_tuple().exponent for p in prices), 0)
+        ticks = [self._ticks(p) for p in prices]
+        low, high = min(ticks), max(ticks)
+        size = MIN_TREE_SIZE
+        while size < 4 * (high - low + 1):
+            size <<= 1
+        # leave room for a quarter of the range on each side before the next rebuild
+        margin = (size - (high - low + 1)) // 2
+        self._origin = high + margin if self.descending else low - margin
+        self._amount_tree = FenwickTree(size)
+        self._notional_tree = FenwickTree(size)
+        self._key_prices = {}
+        for price in self.prices:
+            key = self._key(self._ticks(price))
+            amount = self.amounts[price]
+            self._key_prices[key] = price
+            self._amount_tree.add(key, amount)
+            self._notional_tree.add(key, price * amount)
+
+    def update(self, price, amount):
+        # amount 0 removes the level
+        price = Decimal(price)
+        amount = Decimal(amount)
+        previous = self.amounts.get(price)
+        if amount == ZERO:
+            if previous is None:
+                return
+            key = self._key(self._ticks(price))
+            del self.amounts[price]
+            del self.prices[bisect.bisect_left(self.prices, price)]
+            del self._key_prices[key]
+            self._add(key, price, -previous)
+            return
+        key = self._index(price)
+        if previous is None:
+            bisect.insort(self.prices, price)
+            self._key_prices[key] = price
+            previous = ZERO
+        self.amounts[price] = amount
+        self._add(key, price, amount - previous)
+
+    def _add(self, key, price, delta):
+        self._amount_tree.add(key, delta)
+        self._notional_tree.add(key, price * delta)
+        self.total_amount += delta
+        self.total_notional += price * delta
+
+    def __len__(self):
+        return len(self.prices)
+
+    def __iter__(self):
+        # best price first
+        prices = reversed(self.prices) if self.descending else self.prices
+        for price in prices:
+            yield price, self.amounts[price]
+
+    def best(self):
+        if not self.prices:
+            return None
+        price = self.prices[-1] if self.descending else self.prices[0]
+        return price, self.amounts[price]
+
+    def amount_through(self, price):
+        # total amount of the levels at price or better
+        if self._origin is None:
+            return ZERO
+        ticks = Decimal(price).scaleb(self._scale)
+        # a price between ticks includes the levels strictly better than it
+        ticks = int(ticks.to_integral_value(ROUND_CEILING if self.descending else ROUND_FLOOR))
+        key = self._key(ticks)
+        if key < 0:
+            return ZERO
+        return self._amount_tree.prefix(key)
+
+    def vwap(self, amount):
+        # (average price, filled amount) of taking amount from the best levels
+        amount = Decimal(amount)
+        if amount <= ZERO or not self.prices:
+            return None, ZERO
+        if amount >= self.total_amount:
+            return self.total_notional / self.total_amount, self.total_amount
+        # descend both trees to the first level where the cumulative amount reaches amount
+        amounts = self._amount_tree.nodes
+        notionals = self._notional_tree.nodes
+        size = self._amount_tree.size
+        position = 0
+        filled_before = ZERO
+        notional_before = ZERO
+        step = size
+        while step:
+            node = position + step
+            if node <= size:
+                node_amount = amounts.get(node, ZERO)
+                if filled_before + node_amount < amount:
+                    position = node
+                    filled_before += node_amount
+                    notional_before += notionals.get(node, ZERO)
+            step >>= 1
+        price = self._key_prices[position]
+        return (notional_before + (amount - filled_before) * price) / amount, amount
+
+    def diff(self, other):
+        # levels to apply to self to obtain other, removed levels with amount '0'
+        changes = []
+        for price, amount in other.amounts.items():
+            if self.amounts.get(price) != amount:
+                changes.append([str(price), str(amount)])
+        for price in self.amounts:
+            if price not in other.amounts:
+                changes.append([str(price), '0'])
+        return changes
+
+
+class OrderBook(object):
+
+    def __init__(self, depth=None):
+        self.asks = BookSide(descending=False)
+        self.bids = BookSide(descending=True)
+        self.timestamp = None
+        self.sequence_id = None
+        if depth is not None:
+            self.load(depth)
+
+    def load(self, depth):
+        # depth is the result of bitbankcc_public.get_depth
+        self.asks.clear()
+        self.bids.clear()
+        for price, amount in depth['asks']:
+            self.asks.update(price, amount)
+        for price, amount in depth['bids']:
+            self.bids.update(price, amount)
+        self.timestamp = depth.get('timestamp')
+        self.sequence_id = _sequence(depth.get('sequenceId'))
+
+    def apply_diff(self, diff):
+        # accepts both the depth_diff stream format ('a', 'b', 't', 's') and the output of diff().
+        # returns False when the diff is not newer than the book.
+        sequence_id = _sequence(diff.get('s', diff.get('sequenceId')))
+        if sequence_id is not None and self.sequence_id is not None and sequence_id <= self.sequence_id:
+            return False
+        for price, amount in diff.get('a', diff.get('asks', [])):
+            self.asks.update(price, amount)
+        for price, amount in diff.get('b', diff.get('bids', [])):
+            self.bids.update(price, amount)
+        self.timestamp = diff.get('t', diff.get('timestamp', self.timestamp))
+        if sequence_id is not None:
+            self.sequence_id = sequence_id
+        return True
+
+    def diff(self, other):
+        return {
+            'asks': self.asks.diff(other.asks),
+            'bids': self.bids.diff(other.bids),
+            'timestamp': other.timestamp,
+            'sequenceId': None if other.sequence_id is None else str(other.sequence_id),
+        }
+
+    def best_ask(self):
+        return self.asks.best()
+
+    def best_bid(self):
+        return self.bids.best()
+
+    def spread(self):
+        ask = self.asks.best()
+        bid = self.bids.best()
+        if ask is None or bid is None:
+            return None
+        return ask[0] - bid[0]
+
+    def vwap(self, side, amount):
+        # side is the order side: a buy takes the asks, a sell takes the bids
+        return (self.asks if side == 'buy' else self.bids).vwap(amount)
+
+    def to_depth(self):
+        return {
+            'asks': [[str(price), str(amount)] for price, amount in self.asks],
+            'bids': [[str(price), str(amount)] for price, amount in self.bids],
+            'timestamp': self.timestamp,
+            'sequenceId': None if self.sequence_id is None else str(self.sequence_id),
+        }
+
+
+def _sequence(value):
+    return None if value is None else int(value)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+from .batch import run_batch, MAX_ORDER_IDS
+from .stream import PrivateStream, RESYNC
+from .utils import BitbankClientError
+from collections import OrderedDict
+from decimal import Decimal
+from logging import getLogger
+import threading, time
+
+
+logger = getLogger(__name__)
+
+ACTIVE_STATUSES = frozenset(['INACTIVE', 'UNFILLED', 'PARTIALLY_FILLED'])
+DEFAULT_RECONCILE_INTERVAL = 60.0
+DEFAULT_MAX_FINISHED = 10000
+
+
+def is_active(order):
+    return order.get('status') in ACTIVE_STATUSES
+
+def _progress(order):
+    # an order only moves forward: executed_amount grows and a finished order stays finished.
+    # used to drop updates that arrive after a newer state (stream vs. REST responses).
+    executed = order.get('executed_amount')
+    return (not is_active(order), Decimal(executed) if executed else Decimal(0))
+
+def _orders_of(params):
+    # stream params are a list of orders, or of {'order_id': [...]} for invalidations
+    if isinstance(params, dict):
+        params = [params]
+    return params or []
+
+
+class OrderTracker(object):
+    # client side copy of the account's orders, indexed by order_id and by pair.
+    # it is seeded by get_active_orders, updated by the responses of order/cancel_order/cancel_orders
+    # made through it and by PrivateStream messages, and reconcile() polls only to repair what the
+    # stream may have missed: one get_active_orders per pair plus orders_info for the ids that left it.
+    # finished orders are kept (up to max_finished) so that their status is still answered from memory.
+
+    def __init__(self, private_client, pairs=(), reconcile_interval=DEFAULT_RECONCILE_INTERVAL,
+                 max_finished=DEFAULT_MAX_FINISHED):
+        self.client = private_client
+        self.pairs = list(pairs)
+        self.reconcile_interval = reconcile_interval
+        self.max_finished = max_finished
+        self.orders = {}
+        self.active_by_pair = {}
+        self.finished = OrderedDict()
+        self.stale = set()
+        self.last_reconciled = None
+        self.stream = None
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # queries, answered from memory
+
+    def get(self, order_id):
+        return self.orders.get(int(order_id))
+
+    def status(self, order_id):
+        order = self.orders.get(int(order_id))
+        return None if order is None else order['status']
+
+    def is_active(self, order_id):
+        order = self.orders.get(int(order_id))
+        return order is not None and is_active(order)
+
+    def is_stale(self, order_id):
+        # True until reconcile() has fetched an order whose state may have changed unseen
+        return int(order_id) in self.stale
+
+    def active_orders(self, pair=None):
+        with self._lock:
+            if pair is not None:
+                return list(self.active_by_pair.get(pair, {}).values())
+            return [order for orders in self.active_by_pair.values() for order in orders.values()]
+
+    def __len__(self):
+        return len(self.orders)
+
+    def __contains__(self, order_id):
+        return int(order_id) in self.orders
+
+    # updates
+
+    def apply(self, order):
+        # stores one order dict in the API format; returns False when it is older than what is known
+        order_id = int(order['order_id'])
+        pair = order['pair']
+        with self._lock:
+            known = self.orders.get(order_id)
+            if known is not None and _progress(order) < _progress(known):
+                return False
+            self.orders[order_id] = order
+            self.stale.discard(order_id)
+            if pair not in self.pairs:
+                self.pairs.append(pair)
+            if is_active(order):
+                self.active_by_pair.setdefault(pair, {})[order_id] = order
+                self.finished.pop(order_id, None)
+            else:
+                self.active_by_pair.get(pair, {}).pop(order_id, None)
+                self.finished[order_id] = order
+                self._trim_finished()
+            return True
+
+    def apply_many(self, orders):
+        for order in orders:
+            self.apply(order)
+
+    def invalidate(self, order_ids):
+        # the state of these orders is unknown until the next reconcile() fetches them
+        with self._lock:
+            for order_id in order_ids:
+                order_id = int(order_id)
+                if order_id in self.orders:
+                    self.stale.add(order_id)
+
+    def _trim_finished(self):
+        while len(self.finished) > self.max_finished:
+            order_id, _ = self.finished.popitem(last=False)
+            self.orders.pop(order_id, None)
+            self.stale.discard(order_id)
+
+    # the private API calls that change orders, recorded on the way back
+
+    def order(self, pair, price, amount, side, order_type, post_only=None, trigger_price=None, position_side=None):
+        result = self.client.order(pair, price, amount, side, order_type, post_only, trigger_price, position_side)
+        self.apply(result)
+        return result
+
+    def cancel_order(self, pair, order_id):
+        try:
+            result = self.client.cancel_order(pair, order_id)
+        except Exception:
+            # e.g. 50026/50027 (already canceled or filled) or a timeout: the order may no longer be active
+            self.invalidate([order_id])
+            raise
+        self.apply(result)
+        return result
+
+    def cancel_orders(self, pair, order_ids):
+        try:
+            result = self.client.cancel_orders(pair, order_ids)
+        except Exception:
+            self.invalidate(order_ids)
+            raise
+        self.apply_many(result['orders'])
+        # ids left out of the result were not canceled, most likely because they already finished
+        returned = set(int(order['order_id']) for order in result['orders'])
+        self.invalidate([order_id for order_id in order_ids if int(order_id) not in returned])
+        return result
+
+    # stream
+
+    def on_message(self, method, params):
+        # PrivateStream callback; other channels (asset_update, spot_trade, ...) are ignored
+        if method in ('spot_order_new', 'spot_order'):
+            self.apply_many(_orders_of(params))
+        elif method == 'spot_order_invalidation':
+            for item in _orders_of(params):
+                ids = item.get('order_id', [])
+                self.invalidate(ids if isinstance(ids, list) else [ids])
+        elif method == RESYNC:
+            # messages may have been lost while disconnected
+            self._safe_reconcile()
+
+    # reconciliation
+
+    def seed(self, pairs=None):
+        return self.reconcile(pairs)
+
+    def reconcile(self, pairs=None):
+        # returns the number of orders whose state changed
+        pairs = list(pairs or self.pairs)
+        snapshots = run_batch([(self.client.get_active_orders, (pair,)) for pair in pairs],
+                              getattr(self.client, 'pool_size', len(pairs) or 1))
+        changed = 0
+        missing = []
+        with self._lock:
+            for pair, result in zip(pairs, snapshots):
+                if isinstance(result, BitbankClientError):
+                    logger.warning('reconcile %s: %s', pair, result)
+                    continue
+                listed = set()
+                for order in result['orders']:
+                    listed.add(int(order['order_id']))
+                    changed += self._apply_changed(order)
+                for order_id in self.active_by_pair.get(pair, {}):
+                    if order_id not in listed:
+                        missing.append((pair, order_id))
+            missing_ids = set(order_id for _, order_id in missing)
+            missing += [(self.orders[order_id]['pair'], order_id)
+                        for order_id in self.stale if order_id not in missing_ids]
+        if missing:
+            # orders that left the active list (or were invalidated) are fetched once to learn how they ended
+            results = self.client.get_orders_info_many(missing, MAX_ORDER_IDS)
+            for (pair, order_id), order in zip(missing, results):
+                if isinstance(order, BitbankClientError):
+                    logger.warning('reconcile %s %s: %s', pair, order_id, order)
+                else:
+                    with self._lock:
+                        self.stale.discard(order_id)
+                    if order is not None:
+                        changed += self._apply_changed(order)
+        self.last_reconciled = time.time()
+        return changed
+
+    def _apply_changed(self, order):
+        known = self.orders.get(int(order['order_id']))
+        if known is not None and known.get('status') == order.get('status') \
+                and known.get('executed_amount') == order.get('executed_amount'):
+            return 0
+        return 1 if self.apply(order) else 0
+
+    def _safe_reconcile(self):
+        try:
+            self.reconcile()
+        except Exception as e:
+            logger.warning('reconcile failed: %r', e)
+
+    def start(self, stream=True, **stream_kwargs):
+        # seeds the store, subscribes to the private stream and reconciles every reconcile_interval
+        self.seed()
+        if stream and self.stream is None:
+            self.stream = PrivateStream(self.client, on_message=self.on_message, **stream_kwargs).start()
+        if self._thread is None and self.reconcile_interval:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=type(self).__name__)
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        if self.stream is not None:
+            self.stream.stop(timeout)
+            self.stream = None
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run(self):
+        while not self._stop.wait(self.reconcile_interval):
+            self._safe_reconcile()
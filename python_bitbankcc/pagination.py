@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+from .utils import BitbankClientError
+
+# largest count accepted by trade_history, and by deposit_history / withdrawal_history
+MAX_PAGE_SIZE = 1000
+MAX_TRANSFER_PAGE_SIZE = 100
+
+
+class PageWalker(object):
+    # the paging state shared by iter_history and its asyncio counterpart. the next page starts at
+    # the last timestamp seen, and only the ids at that timestamp are kept to drop the records
+    # repeated across the boundary, so memory does not grow with the range.
+
+    def __init__(self, id_key, time_key, count):
+        self.id_key = id_key
+        self.time_key = time_key
+        self.count = count
+        self.boundary_time = None
+        self.boundary_ids = set()
+
+    def is_full(self, page):
+        return len(page) >= self.count
+
+    def next_since(self, page):
+        return page[-1][self.time_key]
+
+    def new_records(self, page):
+        records = []
+        for record in page:
+            record_time = record[self.time_key]
+            if record_time == self.boundary_time and record[self.id_key] in self.boundary_ids:
+                continue
+            if record_time != self.boundary_time:
+                self.boundary_time = record_time
+                self.boundary_ids = set()
+            self.boundary_ids.add(record[self.id_key])
+            records.append(record)
+        if not records and self.is_full(page):
+            # a full page inside one millisecond: the API has no cursor below the timestamp, so the
+            # rest of that millisecond cannot be reached and silently skipping it would lose records
+            raise BitbankClientError('more than %d records at %s, retry with a larger count'
+                                     % (self.count, self.boundary_time))
+        return records
+
+
+def iter_history(fetch, id_key, time_key, since=None, end=None, count=MAX_PAGE_SIZE, prefetch=False):
+    # walks [since, end] in ascending order with fetch(since, end, count) -> list of records.
+    # with prefetch the next page is requested while the caller handles the current one.
+    walker = PageWalker(id_key, time_key, count)
+    executor = None
+    if prefetch:
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        page = fetch(since, end, count)
+        while page:
+            future = None
+            if executor is not None and walker.is_full(page):
+                future = executor.submit(fetch, walker.next_since(page), end, count)
+            for record in walker.new_records(page):
+                yield record
+            if not walker.is_full(page):
+                return
+            page = future.result() if future is not None else fetch(walker.next_since(page), end, count)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+from .private_api import bitbankcc_private, default_config
+from .transport import make_transport, DEFAULT_POOL_SIZE
+from .batch import run_batch
+from .cache import TTLCache
+from .utils import BitbankClientError
+from collections import OrderedDict
+
+
+class bitbankcc_private_pool(object):
+    # one bitbankcc_private per account, all over a single connection pool. rate limits and
+    # caches stay per account since the server counts them per API key.
+
+    def __init__(self, accounts, config=default_config):
+        # accounts: {name: (api_key, api_secret)}
+        config = dict(config)
+        config['pool_size'] = max(config.get('pool_size', DEFAULT_POOL_SIZE), len(accounts))
+        self.pool_size = config['pool_size']
+        self.session = make_transport(config)
+        cache = config.get('cache')
+        self.clients = OrderedDict()
+        for name, (api_key, api_secret) in accounts.items():
+            if isinstance(cache, TTLCache):
+                config['cache'] = TTLCache(cache.ttls, cache.max_entries)
+            self.clients[name] = bitbankcc_private(api_key, api_secret, config=config, session=self.session)
+
+    def __getitem__(self, name):
+        return self.clients[name]
+
+    def __iter__(self):
+        return iter(self.clients)
+
+    def __len__(self):
+        return len(self.clients)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def call(self, name, method_name, *args, **kwargs):
+        return getattr(self.clients[name], method_name)(*args, **kwargs)
+
+    def map(self, method_name, *args, **kwargs):
+        # runs the same call on every account (or the names in accounts=) concurrently and
+        # returns {name: result}, a failed account mapping to its BitbankClientError
+        names = kwargs.pop('accounts', None) or list(self.clients)
+        max_workers = kwargs.pop('max_workers', None) or self.pool_size
+        calls = [(lambda name=name: self.call(name, method_name, *args, **kwargs), ()) for name in names]
+        return OrderedDict(zip(names, run_batch(calls, max_workers)))
+
+    def get_active_orders_all(self, pair, options=None):
+        # active orders of every account in one list, each order tagged with its 'account'
+        return aggregate_orders(self.map('get_active_orders', pair, options))
+
+    def get_asset_all(self):
+        return self.map('get_asset')
+
+
+def aggregate_orders(results):
+    orders = []
+    errors = OrderedDict()
+    for name, result in results.items():
+        if isinstance(result, BitbankClientError):
+            errors[name] = result
+            continue
+        for order in result['orders']:
+            order = dict(order)
+            order['account'] = name
+            orders.append(order)
+    return {'orders': orders, 'errors': errors}
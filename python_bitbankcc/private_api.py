@@ -24,10 +24,16 @@
 # SOFTWARE.
 
 from __future__ import absolute_import, division, print_function, unicode_literals
-from .utils import error_parser, try_json_parse
+from .session import session_mixin, perform
+from .ratelimit import make_rate_limiter
+from .transport import DEFAULT_POOL_SIZE, DEFAULT_MAX_RETRIES, DEFAULT_TIMEOUT
+from .retry import is_idempotent
+from .batch import run_batch, run_chunked_by_pair, MAX_CONCURRENT_ORDERS, MAX_ORDER_IDS
+from .clock import ServerClock, NonceGenerator, now_ms
+from .pagination import iter_history, MAX_PAGE_SIZE, MAX_TRANSFER_PAGE_SIZE
 from hashlib import sha256
 from logging import getLogger
-import requests, hmac, time, json, contextlib, re
+import hmac, time, json, re
 
 try:
     from urllib import urlencode
@@ -68,45 +74,119 @@ def make_request_time_header(query_data, api_key, api_secret, time_window):
         'ACCESS-SIGNATURE': sign_request(api_secret, message)
     }
 
+class RequestSigner(object):
+    # keyed HMAC state and the constant headers are built once per client; each request
+    # only copies the HMAC and adds the time (or nonce) and the signature.
+
+    def __init__(self, api_key, api_secret, auth_method='request_time', time_window=5000, clock=None, nonce=None):
+        self.use_request_time = auth_method == 'request_time'
+        self.clock = clock
+        self.nonce = nonce if nonce is not None else NonceGenerator(clock)
+        self.time_window = str(time_window)
+        self.hmac = hmac.new(bytearray(api_secret, 'utf8'), digestmod=sha256)
+        self.static_headers = {
+            'Content-Type': 'application/json',
+            'ACCESS-KEY': api_key,
+        }
+        if self.use_request_time:
+            self.static_headers['ACCESS-TIME-WINDOW'] = self.time_window
+
+    def sign(self, message):
+        h = self.hmac.copy()
+        h.update(bytearray(message, 'utf8'))
+        return h.hexdigest()
+
+    def headers(self, query_data):
+        headers = self.static_headers.copy()
+        if self.use_request_time:
+            stamp = str(int(self.clock.now_ms() if self.clock is not None else now_ms()))
+            headers['ACCESS-REQUEST-TIME'] = stamp
+            headers['ACCESS-SIGNATURE'] = self.sign(stamp + self.time_window + query_data)
+        else:
+            stamp = str(self.nonce.next())
+            headers['ACCESS-NONCE'] = stamp
+            headers['ACCESS-SIGNATURE'] = self.sign(stamp + query_data)
+        return headers
+
 default_config = {
     'end_point':'https://api.bitbank.cc/v1',
     'auth_method': 'request_time',
     'time_window': 5000,
+    'pool_size': DEFAULT_POOL_SIZE,
+    'max_retries': DEFAULT_MAX_RETRIES,
+    'timeout': DEFAULT_TIMEOUT,
+    'rate_limits': None,
+    'retry_policy': None,
+    'cache': None,
+    'track_server_clock': True,
+    'nonce_file': None,
+    'observers': (),
 }
 
-class bitbankcc_private(object):
+class bitbankcc_private(session_mixin):
 
-    def __init__(self, api_key, api_secret, end_point='https://api.bitbank.cc/v1', config=default_config):
+    def __init__(self, api_key, api_secret, end_point='https://api.bitbank.cc/v1', config=default_config, session=None, rate_limiter=None):
         self.end_point = config['end_point'] if 'end_point' in config else 'https://api.bitbank.cc/v1'
         self.path_stub = get_path_from_end_point(self.end_point)
         self.api_key = api_key
         self.api_secret = api_secret
         self.auth_method = config['auth_method'] if 'auth_method' in config else 'request_time'
         self.time_window = config['time_window'] if 'time_window' in config else 5000
+        track_server_clock = config['track_server_clock'] if 'track_server_clock' in config else True
+        self.clock = ServerClock() if track_server_clock else None
+        self.signer = RequestSigner(api_key, api_secret, self.auth_method, self.time_window, self.clock,
+                                    NonceGenerator(self.clock, config.get('nonce_file')))
+        self.timeout = config['timeout'] if 'timeout' in config else DEFAULT_TIMEOUT
+        self.pool_size = config['pool_size'] if 'pool_size' in config else DEFAULT_POOL_SIZE
+        self.rate_limiter = make_rate_limiter(config, rate_limiter)
+        self.retry_policy = config['retry_policy'] if 'retry_policy' in config else None
+        self.cache = config['cache'] if 'cache' in config else None
+        self.observers = list(config['observers']) if 'observers' in config else []
+        self._open_session(config, session)
 
-    def _get_query(self, path, query):
+    def _prepare_get(self, path, query):
         if len(query) > 0 and '?' not in path :
             path = path + '?'
-        data = self.path_stub + path + urlencode(query)
-        logger.debug('GET: ' + data)
-        headers = make_request_time_header(data, self.api_key, self.api_secret, self.time_window) \
-            if self.auth_method == 'request_time' \
-            else make_nonce_header(data, self.api_key, self.api_secret)
-        uri = self.end_point + path + urlencode(query)
-        with contextlib.closing(requests.get(uri, headers=headers)) as response:
-            response.raise_for_status()
-            return error_parser(try_json_parse(response, logger))
+        path = path + urlencode(query)
+        data = self.path_stub + path
+        logger.debug('GET: %s', data)
+        headers = self.signer.headers(data)
+        uri = self.end_point + path
+        return uri, headers
 
-    def _post_query(self, path, query):
+    def _prepare_post(self, path, query):
         data = json.dumps(query)
-        logger.debug('POST: ' + data)
-        headers = make_request_time_header(data, self.api_key, self.api_secret, self.time_window) \
-            if self.auth_method == 'request_time' \
-            else make_nonce_header(data, self.api_key, self.api_secret)
+        logger.debug('POST: %s', data)
+        headers = self.signer.headers(data)
         uri = self.end_point + path
-        with contextlib.closing(requests.post(uri, data=data, headers=headers)) as response:
-            response.raise_for_status()
-            return error_parser(try_json_parse(response, logger))
+        return uri, data, headers
+
+    def _request(self, method, path, send):
+        if self.retry_policy is None:
+            return send()
+        return self.retry_policy.call(send, is_idempotent(method, path))
+
+    def _send_get(self, path, query):
+        return perform(self, 'GET', path, lambda: self._prepare_get(path, query),
+                       lambda uri, headers: self.session.get(uri, headers=headers, timeout=self.timeout))
+
+    def _send_post(self, path, query):
+        return perform(self, 'POST', path, lambda: self._prepare_post(path, query),
+                       lambda uri, data, headers: self.session.post(uri, data=data, headers=headers, timeout=self.timeout))
+
+    def _get_query(self, path, query):
+        fetch = lambda: self._request('GET', path, lambda: self._send_get(path, query))
+        if self.cache is None:
+            return fetch()
+        return self.cache.get(path, urlencode(sorted(query.items())), fetch)
+
+    def _post_query(self, path, query):
+        try:
+            return self._request('POST', path, lambda: self._send_post(path, query))
+        finally:
+            # also on errors, a timed out order may still have been executed
+            if self.cache is not None:
+                self.cache.invalidate_after(path)
 
     def get_asset(self):
         return self._get_query('/user/assets', {})
@@ -157,6 +237,24 @@ class bitbankcc_private(object):
             'order_ids': order_ids
         })
 
+    def order_many(self, orders, max_workers=None):
+        # orders: list of dicts of order() arguments, e.g.
+        # {'pair': 'btc_jpy', 'price': '131594', 'amount': '0.0001', 'side': 'buy', 'order_type': 'limit'}
+        # results follow the input order, a rejected order is returned as its BitbankClientError
+        max_workers = min(max_workers or self.pool_size, MAX_CONCURRENT_ORDERS)
+        return run_batch([(self._order_from_spec, (spec,)) for spec in orders], max_workers)
+
+    def _order_from_spec(self, spec):
+        return self.order(spec['pair'], spec.get('price'), spec['amount'], spec['side'], spec['order_type'],
+                          spec.get('post_only'), spec.get('trigger_price'), spec.get('position_side'))
+
+    def cancel_orders_many(self, orders, chunk_size=MAX_ORDER_IDS, max_workers=None):
+        # orders: list of (pair, order_id) across any number of pairs
+        return run_chunked_by_pair(self.cancel_orders, orders, chunk_size, max_workers or self.pool_size)
+
+    def get_orders_info_many(self, orders, chunk_size=MAX_ORDER_IDS, max_workers=None):
+        return run_chunked_by_pair(self.get_orders_info, orders, chunk_size, max_workers or self.pool_size)
+
     def get_trade_history(self, pair, order_count, order_id = None, since = None, end = None, order = None):
         params = {
             'pair': pair,
@@ -168,6 +266,10 @@ class bitbankcc_private(object):
         if order != None: params['order'] = order
         return self._get_query('/user/spot/trade_history', params)
 
+    def iter_trade_history(self, pair, since = None, end = None, count = MAX_PAGE_SIZE, prefetch = False):
+        fetch = lambda since, end, count: self.get_trade_history(pair, count, since=since, end=end, order='asc')['trades']
+        return iter_history(fetch, 'trade_id', 'executed_at', since, end, count, prefetch)
+
     def get_margin_positions(self):
         return self._get_query('/user/margin/positions', {})
 
@@ -181,6 +283,10 @@ class bitbankcc_private(object):
         url = '/user/deposit_history'
         return self._get_query(url, params)
 
+    def iter_deposit_history(self, asset = None, since = None, end = None, count = MAX_TRANSFER_PAGE_SIZE, prefetch = False):
+        fetch = lambda since, end, count: self.get_deposit_history(asset, count, since, end, 'asc')['deposits']
+        return iter_history(fetch, 'uuid', 'found_at', since, end, count, prefetch)
+
     def get_withdraw_account(self, asset):
         return self._get_query('/user/withdrawal_account', {
             'asset': asset
@@ -205,5 +311,9 @@ class bitbankcc_private(object):
         url = '/user/withdrawal_history'
         return self._get_query(url, params)
 
+    def iter_withdraw_history(self, asset = None, since = None, end = None, count = MAX_TRANSFER_PAGE_SIZE, prefetch = False):
+        fetch = lambda since, end, count: self.get_withdraw_history(asset, count, since, end, 'asc')['withdrawals']
+        return iter_history(fetch, 'uuid', 'requested_at', since, end, count, prefetch)
+
     def get_subscribe(self):
         return self._get_query('/user/subscribe', {})
@@ -24,23 +24,44 @@
 # SOFTWARE.
 
 from __future__ import absolute_import, division, print_function, unicode_literals
-from .utils import error_parser, try_json_parse
+from .session import session_mixin, perform
+from .batch import run_batch
+from .ratelimit import make_rate_limiter
+from .transport import DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT
 from logging import getLogger
-import requests, contextlib
 
 
 logger = getLogger(__name__)
 
 
-class bitbankcc_public(object):
+class bitbankcc_public(session_mixin):
 
-    def __init__(self, end_point='https://public.bitbank.cc'):
+    def __init__(self, end_point='https://public.bitbank.cc', config=None, session=None, rate_limiter=None):
+        if config is None:
+            config = {}
         self.end_point = end_point
+        self.timeout = config['timeout'] if 'timeout' in config else DEFAULT_TIMEOUT
+        self.pool_size = config['pool_size'] if 'pool_size' in config else DEFAULT_POOL_SIZE
+        self.rate_limiter = make_rate_limiter(config, rate_limiter)
+        self.retry_policy = config['retry_policy'] if 'retry_policy' in config else None
+        self.cache = config['cache'] if 'cache' in config else None
+        self.observers = list(config['observers']) if 'observers' in config else []
+        self.clock = None
+        self._open_session(config, session)
 
     def _query(self, query_url):
-        with contextlib.closing(requests.get(query_url)) as response:
-            response.raise_for_status()
-            return error_parser(try_json_parse(response, logger))
+        if self.cache is None:
+            return self._fetch(query_url)
+        return self.cache.get(query_url[len(self.end_point):], query_url, lambda: self._fetch(query_url))
+
+    def _fetch(self, query_url):
+        if self.retry_policy is None:
+            return self._send(query_url)
+        return self.retry_policy.call(lambda: self._send(query_url))
+
+    def _send(self, query_url):
+        return perform(self, 'GET', query_url[len(self.end_point):], lambda: (query_url,),
+                       lambda uri: self.session.get(uri, timeout=self.timeout))
 
     def get_ticker(self, pair):
         path = '/' + pair + '/ticker'
@@ -71,3 +92,20 @@ class bitbankcc_public(object):
         path = '/' + pair + '/circuit_break_info'
         return self._query(self.end_point + path)
 
+    def batch(self, calls, max_workers=None):
+        # calls: list of (method_name, args) e.g. [('get_depth', ('btc_jpy',)), ('get_ticker', ('xrp_jpy',))]
+        return run_batch([(getattr(self, name), tuple(args)) for name, args in calls],
+                         max_workers or self.pool_size)
+
+    def batch_by_pair(self, method_name, pairs, *args, **kwargs):
+        results = self.batch([(method_name, (pair,) + args) for pair in pairs], **kwargs)
+        return dict(zip(pairs, results))
+
+    def get_ticker_many(self, pairs, max_workers=None):
+        return self.batch_by_pair('get_ticker', pairs, max_workers=max_workers)
+
+    def get_depth_many(self, pairs, max_workers=None):
+        return self.batch_by_pair('get_depth', pairs, max_workers=max_workers)
+
+    def get_transactions_many(self, pairs, yyyymmdd=None, max_workers=None):
+        return self.batch_by_pair('get_transactions', pairs, yyyymmdd, max_workers=max_workers)
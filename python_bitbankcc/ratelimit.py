@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+import heapq, itertools, threading, time
+
+
+PRIORITY_CANCEL = 0
+PRIORITY_ORDER = 1
+PRIORITY_QUERY = 2
+
+# bitbank documents separate limits for QUERY (GET and read-only POST) and UPDATE (order/cancel/withdraw) calls
+DEFAULT_RATE_LIMITS = {
+    'query': (10, 10),
+    'update': (6, 6),
+}
+
+# POST endpoints that mutate state and the lane they are queued in; any other request is a query
+UPDATE_ENDPOINTS = {
+    '/user/spot/order': PRIORITY_ORDER,
+    '/user/spot/cancel_order': PRIORITY_CANCEL,
+    '/user/spot/cancel_orders': PRIORITY_CANCEL,
+    '/user/request_withdrawal': PRIORITY_ORDER,
+}
+
+
+def classify_endpoint(method, path):
+    if method == 'POST' and path in UPDATE_ENDPOINTS:
+        return 'update', UPDATE_ENDPOINTS[path]
+    return 'query', PRIORITY_QUERY
+
+
+class TokenBucket(object):
+    # waiters are served strictly by (priority, arrival) so a queued cancel overtakes queued orders.
+    # the lock is a plain threading lock, never held across an await, so the bucket can be shared
+    # by threads and asyncio tasks at the same time.
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.cond = threading.Condition(threading.Lock())
+        self.waiters = []
+        self.counter = itertools.count()
+        self.acquired = 0
+        self.waited = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _try_take(self, ticket):
+        # returns 0 when the token was taken, otherwise the number of seconds to wait
+        now = time.monotonic()
+        self._refill(now)
+        if self.waiters[0] == ticket and self.tokens >= 1:
+            heapq.heappop(self.waiters)
+            self.tokens -= 1
+            self.cond.notify_all()
+            return 0
+        return max((1 - self.tokens) / self.rate, 0.001)
+
+    def _record(self, started, blocked):
+        # returns the seconds spent waiting for the token
+        self.acquired += 1
+        if not blocked:
+            return 0.0
+        waited = time.monotonic() - started
+        self.waited += 1
+        self.wait_time_total += waited
+        self.wait_time_max = max(self.wait_time_max, waited)
+        return waited
+
+    def _abandon(self, ticket):
+        # must be called with the lock held
+        if ticket in self.waiters:
+            self.waiters.remove(ticket)
+            heapq.heapify(self.waiters)
+            self.cond.notify_all()
+
+    def acquire(self, priority=PRIORITY_QUERY):
+        started = time.monotonic()
+        with self.cond:
+            ticket = (priority, next(self.counter))
+            heapq.heappush(self.waiters, ticket)
+            blocked = False
+            try:
+                delay = self._try_take(ticket)
+                while delay:
+                    blocked = True
+                    self.cond.wait(delay)
+                    delay = self._try_take(ticket)
+            except BaseException:
+                self._abandon(ticket)
+                raise
+            return self._record(started, blocked)
+
+    async def acquire_async(self, priority=PRIORITY_QUERY):
+        import asyncio
+        started = time.monotonic()
+        with self.cond:
+            ticket = (priority, next(self.counter))
+            heapq.heappush(self.waiters, ticket)
+        blocked = False
+        try:
+            while True:
+                with self.cond:
+                    delay = self._try_take(ticket)
+                    if delay == 0:
+                        return self._record(started, blocked)
+                blocked = True
+                await asyncio.sleep(delay)
+        except BaseException:
+            with self.cond:
+                self._abandon(ticket)
+            raise
+
+    def metrics(self):
+        with self.cond:
+            return {
+                'queue_depth': len(self.waiters),
+                'tokens': self.tokens,
+                'acquired': self.acquired,
+                'waited': self.waited,
+                'wait_time_total': self.wait_time_total,
+                'wait_time_max': self.wait_time_max,
+            }
+
+
+class RateLimiter(object):
+
+    def __init__(self, limits=None):
+        if limits is None:
+            limits = DEFAULT_RATE_LIMITS
+        self.buckets = dict((name, TokenBucket(rate, capacity)) for name, (rate, capacity) in limits.items())
+
+    def acquire(self, method, path):
+        endpoint_class, priority = classify_endpoint(method, path)
+        if endpoint_class in self.buckets:
+            return self.buckets[endpoint_class].acquire(priority)
+        return 0
+
+    async def acquire_async(self, method, path):
+        endpoint_class, priority = classify_endpoint(method, path)
+        if endpoint_class in self.buckets:
+            return await self.buckets[endpoint_class].acquire_async(priority)
+        return 0
+
+    def metrics(self):
+        return dict((name, bucket.metrics()) for name, bucket in self.buckets.items())
+
+
+def make_rate_limiter(config, rate_limiter):
+    if rate_limiter is not None:
+        return rate_limiter
+    if 'rate_limits' in config and config['rate_limits'] is not None:
+        return RateLimiter(config['rate_limits'])
+    return None
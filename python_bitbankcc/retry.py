@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+from .utils import BitbankClientError, REJECTED_BEFORE_EXECUTION_CODES
+from logging import getLogger
+import random, sys, time
+
+
+logger = getLogger(__name__)
+
+# POST endpoints whose replay could execute twice; every other call is safe to send again
+NON_IDEMPOTENT_ENDPOINTS = frozenset([
+    '/user/spot/order',
+    '/user/request_withdrawal',
+])
+
+
+def is_idempotent(method, path):
+    return method != 'POST' or path not in NON_IDEMPOTENT_ENDPOINTS
+
+def is_transport_error(exc):
+    # requests exceptions derive from IOError. aiohttp errors do not, so they are recognised here
+    # when aiohttp is loaded: connection drops, broken payloads and 5xx responses.
+    # HTTP 4xx responses are final.
+    aiohttp = sys.modules.get('aiohttp')
+    if aiohttp is not None:
+        if isinstance(exc, aiohttp.ClientResponseError):
+            return exc.status >= 500
+        if isinstance(exc, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)):
+            return True
+    asyncio = sys.modules.get('asyncio')
+    if asyncio is not None and isinstance(exc, asyncio.TimeoutError):
+        return True
+    if not isinstance(exc, (IOError, OSError)):
+        return False
+    response = getattr(exc, 'response', None)
+    status = getattr(response, 'status_code', None)
+    return status is None or status >= 500
+
+class RetryPolicy(object):
+
+    def __init__(self, max_attempts=3, base_delay=0.1, max_delay=2.0, deadline=10.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def should_retry(self, exc, idempotent):
+        if isinstance(exc, BitbankClientError):
+            # the result of a non-idempotent call is only known when the server rejected it up front
+            return exc.retryable if idempotent else exc.code in REJECTED_BEFORE_EXECUTION_CODES
+        # a transport failure leaves an order in an unknown state, so it is never replayed blindly
+        return idempotent and is_transport_error(exc)
+
+    def backoff(self, attempt):
+        # full jitter: uniform in [0, min(max_delay, base_delay * 2^attempt)]
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _next_delay(self, exc, attempt, idempotent, started):
+        # returns None when exc must be raised
+        if attempt + 1 >= self.max_attempts or not self.should_retry(exc, idempotent):
+            return None
+        delay = self.backoff(attempt)
+        if self.deadline is not None and time.monotonic() - started + delay > self.deadline:
+            return None
+        logger.debug('retry %d in %.3fs: %r' % (attempt + 1, delay, exc))
+        return delay
+
+    def call(self, fn, idempotent=True):
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                delay = self._next_delay(e, attempt, idempotent, started)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def call_async(self, fn, idempotent=True):
+        import asyncio
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return await fn()
+            except Exception as e:
+                delay = self._next_delay(e, attempt, idempotent, started)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
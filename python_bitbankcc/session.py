@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+from .utils import error_parser, try_json_parse
+from .metrics import RequestEvent, notify
+from .clock import now_ms
+from .transport import make_transport, as_transport
+from logging import getLogger
+from time import perf_counter
+import contextlib
+
+
+logger = getLogger(__name__)
+
+
+class session_mixin(object):
+    # shared lifecycle of the sync clients: the pool is closed by close() only when the client
+    # created it, a caller supplied session is left open for its other users.
+
+    def _open_session(self, config, session):
+        self._owns_session = session is None
+        self.session = self._make_session(config) if session is None else self._adopt_session(session, config)
+
+    def _make_session(self, config):
+        # one keep-alive pool per client so that consecutive calls skip the TCP/TLS handshake
+        return make_transport(config)
+
+    def _adopt_session(self, session, config):
+        return as_transport(session)
+
+    def add_observer(self, observer):
+        # observer(event) is called with a RequestEvent after every HTTP request
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        self.observers.remove(observer)
+
+    def close(self):
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def perform(client, method, endpoint, prepare, send):
+    # one attempt of an API call: rate limit, sign (prepare), send, decode. the timings are
+    # only assembled into a RequestEvent when the client has observers.
+    event = RequestEvent(method, endpoint) if client.observers else None
+    started = perf_counter()
+    if client.rate_limiter is not None:
+        client.rate_limiter.acquire(method, endpoint)
+    queued = perf_counter()
+    args = prepare()
+    sent_at = now_ms()
+    signed = perf_counter()
+    try:
+        with contextlib.closing(send(*args)) as response:
+            received = perf_counter()
+            if client.clock is not None:
+                client.clock.observe_response(sent_at, response)
+            if event is not None:
+                event.status = response.status_code
+                event.bytes_received = len(response.content)
+                event.wait_time = response.elapsed.total_seconds()
+                event.read_time = max(received - signed - event.wait_time, 0.0)
+            response.raise_for_status()
+            result = try_json_parse(response, logger)
+            if event is not None:
+                event.decode_time = perf_counter() - received
+            return error_parser(result)
+    except Exception as e:
+        if event is not None:
+            event.error = e
+            event.error_code = getattr(e, 'code', None)
+        raise
+    finally:
+        if event is not None:
+            event.queue_time = queued - started
+            event.sign_time = signed - queued
+            event.total_time = perf_counter() - started
+            notify(client.observers, event)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+from .transport import make_transport
+from logging import getLogger
+from urllib.parse import urlencode
+import json, queue, random, threading, uuid
+
+try:
+    import websocket
+except ImportError:
+    websocket = None
+
+
+logger = getLogger(__name__)
+
+PUBLIC_STREAM_END_POINT = 'wss://stream.bitbank.cc/socket.io/?EIO=4&transport=websocket'
+PUBNUB_END_POINT = 'https://ps.pndsn.com'
+PUBNUB_SUBSCRIBE_KEY = 'sub-c-ecebae8e-dd60-11e6-b6b1-02ee2ddab7fe'
+
+# channel name of the message emitted after a reconnect; data is the list of subscribed channels.
+# anything derived from diffs (e.g. an OrderBook fed by depth_diff) must be reloaded on it.
+RESYNC = 'resync'
+
+
+def public_rooms(pair, channels=('ticker', 'transactions', 'depth_diff', 'depth_whole')):
+    return [channel + '_' + pair for channel in channels]
+
+
+class StreamSubscriber(object):
+    # runs the connection on a daemon thread and reconnects with jittered exponential backoff.
+    # messages go to on_message(channel, data) when given, otherwise to a queue read by messages().
+
+    def __init__(self, on_message=None, reconnect_delay=1.0, max_reconnect_delay=30.0):
+        self.on_message = on_message
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=type(self).__name__)
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self._disconnect()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and not self._stop.is_set()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def messages(self, timeout=None):
+        # yields (channel, data) until stop() is called or nothing arrives within timeout
+        while not self._stop.is_set() or not self.queue.empty():
+            try:
+                yield self.queue.get(timeout=timeout if timeout is not None else 0.5)
+            except queue.Empty:
+                if timeout is not None:
+                    return
+
+    def _emit(self, channel, data):
+        # a failing callback must not look like a disconnect: the message would be replayed on
+        # every reconnect and the stream would stall on it
+        if self.on_message is None:
+            self.queue.put((channel, data))
+            return
+        try:
+            self.on_message(channel, data)
+        except Exception:
+            logger.exception('on_message failed for %s', channel)
+
+    def _run(self):
+        delay = self.reconnect_delay
+        connected_before = False
+        while not self._stop.is_set():
+            try:
+                self._connect()
+                if connected_before:
+                    self._emit(RESYNC, self.channels())
+                connected_before = True
+                delay = self.reconnect_delay
+                self._read_loop()
+            except Exception as e:
+                if not self._stop.is_set():
+                    logger.warning('stream disconnected, reconnecting: %r', e)
+            finally:
+                self._disconnect()
+            self._stop.wait(random.uniform(delay / 2, delay))
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def channels(self):
+        raise NotImplementedError
+
+    def _connect(self):
+        raise NotImplementedError
+
+    def _read_loop(self):
+        raise NotImplementedError
+
+    def _disconnect(self):
+        pass
+
+
+class PublicStream(StreamSubscriber):
+    # socket.io (engine.io v4) over websocket; rooms are e.g. 'ticker_btc_jpy', 'depth_diff_btc_jpy'
+
+    def __init__(self, rooms, end_point=PUBLIC_STREAM_END_POINT, **kwargs):
+        if websocket is None:
+            raise ImportError('websocket-client is required for PublicStream: pip install websocket-client')
+        super(PublicStream, self).__init__(**kwargs)
+        self.rooms = list(rooms)
+        self.end_point = end_point
+        self.ws = None
+
+    def channels(self):
+        return list(self.rooms)
+
+    def _connect(self):
+        self.ws = websocket.create_connection(self.end_point, timeout=10)
+        packet = self.ws.recv()
+        if not packet.startswith('0'):
+            raise IOError('unexpected engine.io handshake: ' + packet)
+        handshake = json.loads(packet[1:])
+        # the server pings every pingInterval, a silent connection is dead after pingTimeout more
+        self.ws.settimeout((handshake['pingInterval'] + handshake['pingTimeout']) / 1000.0)
+        self.ws.send('40')
+        for room in self.rooms:
+            self.ws.send('42' + json.dumps(['join-room', room]))
+
+    def _read_loop(self):
+        while not self._stop.is_set():
+            packet = self.ws.recv()
+            if packet == '2':
+                self.ws.send('3')
+            elif packet.startswith('42'):
+                event = json.loads(packet[2:])
+                if event[0] == 'message':
+                    self._emit(event[1]['room_name'], event[1]['message']['data'])
+            elif packet == '' or packet == '1' or packet.startswith('41'):
+                return
+
+    def _disconnect(self):
+        ws, self.ws = self.ws, None
+        if ws is not None:
+            ws.close()
+
+
+class PrivateStream(StreamSubscriber):
+    # PubNub long-poll subscription on the channel returned by bitbankcc_private.get_subscribe.
+    # messages are emitted as (method, params), e.g. ('spot_order', [...]).
+    # the timetoken survives reconnects so PubNub replays what was published in between.
+
+    def __init__(self, private_client, end_point=PUBNUB_END_POINT, subscribe_key=PUBNUB_SUBSCRIBE_KEY,
+                 poll_timeout=310, **kwargs):
+        super(PrivateStream, self).__init__(**kwargs)
+        self.client = private_client
+        self.end_point = end_point
+        self.subscribe_key = subscribe_key
+        self.poll_timeout = poll_timeout
+        self.uuid = str(uuid.uuid4())
+        self.channel = None
+        self.token = None
+        self.timetoken = '0'
+        self.region = None
+        self.session = None
+
+    def channels(self):
+        return [self.channel]
+
+    def _connect(self):
+        # the token expires, so it is fetched again on every reconnect
+        subscribe = self.client.get_subscribe()
+        self.channel = subscribe['pubnub_channel']
+        self.token = subscribe['pubnub_token']
+        self.session = make_transport({'pool_size': 1})
+
+    def _read_loop(self):
+        uri = '%s/v2/subscribe/%s/%s/0' % (self.end_point, self.subscribe_key, self.channel)
+        while not self._stop.is_set():
+            params = {'tt': self.timetoken, 'uuid': self.uuid, 'auth': self.token}
+            if self.region is not None:
+                params['tr'] = self.region
+            response = self.session.get(uri + '?' + urlencode(params), timeout=(10, self.poll_timeout))
+            if response.status_code == 403:
+                return
+            response.raise_for_status()
+            body = response.json()
+            for message in body.get('m', []):
+                data = message.get('d')
+                if isinstance(data, dict) and 'method' in data:
+                    self._emit(data['method'], data.get('params'))
+                else:
+                    self._emit(message.get('c', self.channel), data)
+            self.timetoken = body['t']['t']
+            self.region = body['t'].get('r')
+
+    def _disconnect(self):
+        session, self.session = self.session, None
+        if session is not None:
+            session.close()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# MIT License
+#
+# Copyright (c) 2017 bitbank, inc. (ビットバンク株式会社)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+from .retry import NON_IDEMPOTENT_ENDPOINTS
+from datetime import timedelta
+from time import perf_counter
+from urllib.parse import urlsplit
+import http.client, json, threading
+
+
+# HTTP backends behind the clients. each one keeps a keep-alive connection pool and returns
+# objects with the subset of requests.Response the clients use: status_code, headers, content,
+# elapsed, raise_for_status(), json() and close(). the backend library is imported when the
+# transport is created, not when python_bitbankcc is imported.
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_RETRIES = 0
+DEFAULT_TIMEOUT = None
+
+
+class TransportError(IOError):
+    # connection level failure of the urllib3 and http.client backends
+    pass
+
+
+class HTTPError(IOError):
+    def __init__(self, message, response=None):
+        super(HTTPError, self).__init__(message)
+        self.response = response
+
+
+class Response(object):
+    __slots__ = ('status_code', 'reason', 'headers', 'content', 'elapsed', 'url')
+
+    def __init__(self, status_code, reason, headers, content, elapsed, url):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.elapsed = elapsed
+        self.url = url
+
+    def raise_for_status(self):
+        if 400 <= self.status_code < 600:
+            raise HTTPError('%d %s for url: %s' % (self.status_code, self.reason, self.url), response=self)
+
+    def json(self):
+        return json.loads(self.content)
+
+    def close(self):
+        pass
+
+
+def is_replayable(method, path):
+    # path is the full URL path, e.g. /v1/user/spot/order
+    return method != 'POST' or not any(path.endswith(end_point) for end_point in NON_IDEMPOTENT_ENDPOINTS)
+
+def split_timeout(timeout):
+    # (connect, read) like requests, or a single value for both
+    if isinstance(timeout, (tuple, list)):
+        return timeout[0], timeout[1]
+    return timeout, timeout
+
+
+class Transport(object):
+
+    def request(self, method, url, headers=None, data=None, timeout=None):
+        raise NotImplementedError
+
+    def get(self, url, headers=None, timeout=None):
+        return self.request('GET', url, headers=headers, timeout=timeout)
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        return self.request('POST', url, headers=headers, data=data, timeout=timeout)
+
+    def head(self, url, headers=None, timeout=None):
+        return self.request('HEAD', url, headers=headers, timeout=timeout)
+
+    def close(self):
+        pass
+
+
+class RequestsTransport(Transport):
+    # requests.Session with an HTTPAdapter sized to the pool. max_retries only covers
+    # connection level failures; urllib3 never replays POST by default.
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, max_retries=DEFAULT_MAX_RETRIES, session=None):
+        import requests
+        from requests.adapters import HTTPAdapter
+        if session is None:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=max_retries)
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.session = session
+
+    def request(self, method, url, headers=None, data=None, timeout=None):
+        return self.session.request(method, url, headers=headers, data=data, timeout=timeout)
+
+    def close(self):
+        self.session.close()
+
+
+class Urllib3Transport(Transport):
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, max_retries=DEFAULT_MAX_RETRIES):
+        import urllib3
+        self.urllib3 = urllib3
+        self.retries = urllib3.Retry(total=max_retries, read=False, redirect=False, raise_on_status=False)
+        self.pool = urllib3.PoolManager(num_pools=pool_size, maxsize=pool_size)
+
+    def request(self, method, url, headers=None, data=None, timeout=None):
+        connect, read = split_timeout(timeout)
+        if isinstance(data, type(u'')):
+            data = data.encode('utf8')
+        started = perf_counter()
+        try:
+            response = self.pool.urlopen(method, url, body=data, headers=headers, retries=self.retries,
+                                         timeout=self.urllib3.Timeout(connect=connect, read=read),
+                                         preload_content=False)
+            elapsed = timedelta(seconds=perf_counter() - started)
+            content = response.read()
+            response.release_conn()
+        except self.urllib3.exceptions.HTTPError as e:
+            raise TransportError(repr(e))
+        return Response(response.status, response.reason, response.headers, content, elapsed, url)
+
+    def close(self):
+        self.pool.clear()
+
+
+class HttpClientTransport(Transport):
+    # standard library only: idle http.client connections are kept per (scheme, host, port)
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, max_retries=DEFAULT_MAX_RETRIES):
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.lock = threading.Lock()
+        self.idle = {}
+
+    def _checkout(self, key, connect_timeout):
+        with self.lock:
+            connections = self.idle.get(key)
+            while connections:
+                conn = connections.pop()
+                if not self._dropped(conn):
+                    return conn, True
+                conn.close()
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return cls(host, port, timeout=connect_timeout), False
+
+    def _dropped(self, conn):
+        # an idle keep-alive socket that is readable was closed by the server
+        import select
+        if conn.sock is None:
+            return True
+        try:
+            return bool(select.select([conn.sock], [], [], 0)[0])
+        except (OSError, ValueError):
+            return True
+
+    def _checkin(self, key, conn):
+        with self.lock:
+            connections = self.idle.setdefault(key, [])
+            if len(connections) < self.pool_size:
+                connections.append(conn)
+                return
+        conn.close()
+
+    def request(self, method, url, headers=None, data=None, timeout=None):
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path + ('?' + parts.query if parts.query else '')
+        connect, read = split_timeout(timeout)
+        if isinstance(data, type(u'')):
+            data = data.encode('utf8')
+        replayable = is_replayable(method, parts.path)
+        attempts = 0
+        resent = False
+        while True:
+            conn, reused = self._checkout(key, connect)
+            started = perf_counter()
+            try:
+                conn.request(method, path, body=data, headers=headers or {})
+                if conn.sock is not None:
+                    conn.sock.settimeout(read)
+                response = conn.getresponse()
+                elapsed = timedelta(seconds=perf_counter() - started)
+                content = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                # a reused connection can be closed by the server just as it is picked. the server
+                # may still have read the request, so only calls that are safe to replay are sent
+                # once more on a new connection; an order or withdrawal is left to the caller.
+                if reused and replayable and not resent and isinstance(
+                        e, (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)):
+                    resent = True
+                    continue
+                if attempts < self.max_retries and not reused and isinstance(e, ConnectionRefusedError):
+                    attempts += 1
+                    continue
+                raise TransportError(repr(e))
+            if response.will_close:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            return Response(response.status, response.reason, response.msg, content, elapsed, url)
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+
+TRANSPORTS = {
+    'requests': RequestsTransport,
+    'urllib3': Urllib3Transport,
+    'http.client': HttpClientTransport,
+}
+
+
+def make_transport(config):
+    # config['transport'] is a Transport instance or one of TRANSPORTS; by default requests
+    # when it is installed, otherwise the standard library
+    transport = config.get('transport')
+    if isinstance(transport, Transport):
+        return transport
+    pool_size = config.get('pool_size', DEFAULT_POOL_SIZE)
+    max_retries = config.get('max_retries', DEFAULT_MAX_RETRIES)
+    if transport is None:
+        try:
+            return RequestsTransport(pool_size, max_retries)
+        except ImportError:
+            return HttpClientTransport(pool_size, max_retries)
+    return TRANSPORTS[transport](pool_size, max_retries)
+
+
+def as_transport(session):
+    # accepts a Transport or a requests.Session supplied by the caller
+    if session is None or isinstance(session, Transport):
+        return session
+    return RequestsTransport(session=session)
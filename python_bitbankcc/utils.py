@@ -23,17 +23,44 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import json
+
+# decodes straight from the response bytes; picked on first use by fastest_json_decoder
+json_loads = None
+
 class BitbankClientError(Exception):
-    def __init__(self, error_message=None):
+    def __init__(self, error_message=None, code=None):
         self.msg = error_message
+        self.code = code
+        self.retryable = code in RETRYABLE_CODES
     def __str__(self):
         return self.msg
 
+def fastest_json_decoder():
+    try:
+        from orjson import loads
+    except ImportError:
+        try:
+            from ujson import loads
+        except ImportError:
+            loads = json.loads
+    return loads
+
+def set_json_decoder(loads):
+    # loads takes the raw response bytes, e.g. orjson.loads or json.loads
+    global json_loads
+    json_loads = loads
+
 def try_json_parse(response, logger):
+    return try_json_loads(response.content, logger)
+
+def try_json_loads(content, logger):
+    if json_loads is None:
+        set_json_decoder(fastest_json_decoder())
     try:
-        return response.json()
+        return json_loads(content)
     except:
-        logger.debug('Invalid JSON: ' + repr(response.content))
+        logger.debug('Invalid JSON: ' + repr(content))
         raise BitbankClientError('不正なJSONデータがサーバーから返ってきました。お問い合わせください')
 
 def error_parser(json_dict):
@@ -43,7 +70,20 @@ def error_parser(json_dict):
         code = str(json_dict['data']['code'])
         contents = ERROR_CODES[code] if code in ERROR_CODES else '不明なエラーです。サポートにお問い合わせ下さい'
         message = 'エラーコード: ' + code + ' 内容: ' + contents
-        raise BitbankClientError(message)
+        raise BitbankClientError(message, int(code) if code.isdigit() else None)
+
+# errors the server returns before executing the request, so any call can be sent again
+REJECTED_BEFORE_EXECUTION_CODES = frozenset([
+    20034, # ACCESS-REQUEST-TIME skew, the request is signed again with a fresh time
+    20035,
+    70011, # busy
+    70013, # order/cancel throttled under load
+])
+
+# transient errors; 10005 (timeout) may have been executed, so it is only retried for idempotent calls
+RETRYABLE_CODES = REJECTED_BEFORE_EXECUTION_CODES | frozenset([
+    10005,
+])
 
 ERROR_CODES = {
     '10000': 'URLが存在しません',
@@ -32,8 +32,16 @@ setup(
     description = 'Lib for bitbank.cc Private and Public API',
     author = 'BitbankInc',
     author_email = 'system@bitcoinbank.co.jp',
+    python_requires = '>=3.7',
     url = 'https://github.com/bitbankinc/python-bitbankcc/',
     download_url = 'https://github.com/bitbankinc/python-bitbankcc/archive/v0.1.0.tar.gz',
+    extras_require = {
+        'async': ['aiohttp'],
+        'stream': ['websocket-client'],
+        'fast': ['orjson'],
+        'history': ['numpy'],
+        'test': ['pytest', 'aiohttp', 'websocket-client', 'numpy'],
+    },
     keywords = ['trading', 'bitcoin', 'japan', 'API', 'exchange'],
     classifiers = [],
 )
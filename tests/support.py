@@ -0,0 +1,18 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from simulator import Simulator  # noqa: E402
+
+from python_bitbankcc.private_api import default_config  # noqa: E402
+
+
+def private_config(sim, **config):
+    return dict(default_config, end_point=sim.private_end_point, **config)
+
+
+def ladder(n, pair='btc_jpy'):
+    # n buy orders one yen apart, as order_many specs
+    return [{'pair': pair, 'price': str(4000000 + i), 'amount': '0.001', 'side': 'buy', 'order_type': 'limit'}
+            for i in range(n)]
@@ -0,0 +1,72 @@
+import asyncio
+import unittest
+
+import aiohttp
+
+from python_bitbankcc.async_api import bitbankcc_async_public, bitbankcc_async_private, DEFAULT_ASYNC_POOL_SIZE
+
+from .support import Simulator, ladder, private_config
+
+
+class AsyncClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sim = Simulator().start()
+
+    def tearDown(self):
+        self.sim.stop()
+
+    def test_caller_session_is_used_as_is(self):
+        async def main():
+            async with aiohttp.ClientSession() as session:
+                pub = bitbankcc_async_public(self.sim.public_end_point, config={'timeout': 5}, session=session)
+                self.assertIs(pub.session, session)
+                return await pub.get_ticker('btc_jpy')
+        self.assertIn('last', asyncio.run(main()))
+
+    def test_private_defaults_to_async_pool_size(self):
+        prv = bitbankcc_async_private(self.sim.api_key, self.sim.api_secret)
+        self.assertEqual(prv.pool_size, DEFAULT_ASYNC_POOL_SIZE)
+
+    def test_private_get(self):
+        async def main():
+            async with bitbankcc_async_private(self.sim.api_key, self.sim.api_secret,
+                                               config=private_config(self.sim)) as prv:
+                return await prv.get_asset()
+        self.assertEqual(asyncio.run(main())['assets'][0]['asset'], 'jpy')
+
+
+
+class AsyncBulkTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sim = Simulator().start()
+
+    def tearDown(self):
+        self.sim.stop()
+
+    def run_private(self, fn):
+        async def main():
+            async with bitbankcc_async_private(self.sim.api_key, self.sim.api_secret,
+                                               config=private_config(self.sim)) as prv:
+                return await fn(prv)
+        return asyncio.run(main())
+
+    def test_order_and_cancel_many(self):
+        async def requote(prv):
+            placed = await prv.order_many(ladder(35))
+            ids = [('btc_jpy', order['order_id']) for order in placed]
+            return placed, await prv.cancel_orders_many(ids), await prv.get_orders_info_many(ids)
+        placed, canceled, info = self.run_private(requote)
+        self.assertEqual(len(set(order['order_id'] for order in placed)), 35)
+        self.assertEqual([order['order_id'] for order in canceled], [order['order_id'] for order in placed])
+        self.assertTrue(all(order['status'] == 'CANCELED_UNFILLED' for order in canceled + info))
+
+    def test_rejected_order_is_returned_as_error(self):
+        self.sim.forced_errors['/v1/user/spot/order'] = 60011
+        results = self.run_private(lambda prv: prv.order_many(ladder(2)))
+        self.assertEqual([e.code for e in results], [60011, 60011])
+
+
+if __name__ == '__main__':
+    unittest.main()
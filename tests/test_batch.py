@@ -0,0 +1,45 @@
+import unittest
+
+from python_bitbankcc.batch import chunk_by_pair
+from python_bitbankcc.private_api import bitbankcc_private
+from python_bitbankcc.utils import BitbankClientError
+
+from .support import Simulator, ladder, private_config
+
+
+class ChunkTest(unittest.TestCase):
+
+    def test_chunk_by_pair(self):
+        orders = [('btc_jpy', i) for i in range(65)] + [('xrp_jpy', 1)]
+        chunks = chunk_by_pair(orders, 30)
+        self.assertEqual([(pair, len(ids)) for pair, ids in chunks],
+                         [('btc_jpy', 30), ('btc_jpy', 30), ('btc_jpy', 5), ('xrp_jpy', 1)])
+
+
+class BulkOrderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sim = Simulator().start()
+        self.prv = bitbankcc_private(self.sim.api_key, self.sim.api_secret, config=private_config(self.sim))
+
+    def tearDown(self):
+        self.prv.close()
+        self.sim.stop()
+
+    def test_cancel_more_than_one_chunk(self):
+        # the simulator rejects more than 30 ids per call with 40015
+        placed = self.prv.order_many(ladder(65) + ladder(3, 'xrp_jpy'))
+        ids = [(order['pair'], order['order_id']) for order in placed]
+        canceled = self.prv.cancel_orders_many(ids)
+        self.assertEqual([order['order_id'] for order in canceled], [order_id for _, order_id in ids])
+        self.assertEqual(self.prv.get_active_orders('btc_jpy')['orders'], [])
+
+    def test_chunk_error_maps_to_its_ids(self):
+        placed = self.prv.order_many(ladder(2))
+        self.sim.forced_errors['/v1/user/spot/cancel_orders'] = 50004
+        results = self.prv.cancel_orders_many([('btc_jpy', order['order_id']) for order in placed])
+        self.assertTrue(all(isinstance(e, BitbankClientError) and e.code == 50004 for e in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import threading
+import time
+import unittest
+
+from python_bitbankcc.cache import TTLCache
+from python_bitbankcc.public_api import bitbankcc_public
+from python_bitbankcc.utils import BitbankClientError
+
+from .support import Simulator
+
+
+class TTLCacheTest(unittest.TestCase):
+
+    def test_interrupted_fetch_is_not_cached(self):
+        cache = TTLCache({'/tickers_jpy': 60})
+        started = threading.Event()
+        results = []
+
+        def interrupted():
+            started.set()
+            time.sleep(0.05)
+            raise KeyboardInterrupt()
+
+        def owner():
+            try:
+                cache.get('/tickers_jpy', '', interrupted)
+            except KeyboardInterrupt:
+                pass
+
+        def waiter():
+            try:
+                results.append(cache.get('/tickers_jpy', '', lambda: 'fetched'))
+            except BitbankClientError as e:
+                results.append(e)
+
+        thread = threading.Thread(target=owner)
+        thread.start()
+        started.wait()
+        waiting = threading.Thread(target=waiter)
+        waiting.start()
+        thread.join()
+        waiting.join()
+        self.assertIsInstance(results[0], BitbankClientError)
+        self.assertEqual(cache.get('/tickers_jpy', '', lambda: 'fetched'), 'fetched')
+
+
+class CoalescingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sim = Simulator(latency=0.05).start()
+
+    def tearDown(self):
+        self.sim.stop()
+
+    def test_concurrent_misses_share_one_request(self):
+        pub = bitbankcc_public(self.sim.public_end_point, config={'cache': TTLCache(), 'pool_size': 8})
+        results = pub.batch([('get_tickers_jpy', ())] * 8)
+        self.assertEqual(self.sim.requests, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        pub.get_tickers_jpy()
+        self.assertEqual(self.sim.requests, 1)
+        pub.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
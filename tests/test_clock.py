@@ -0,0 +1,128 @@
+import os
+import random
+import shutil
+import tempfile
+import threading
+import unittest
+from email.utils import formatdate
+
+from python_bitbankcc.clock import ServerClock, NonceGenerator
+
+
+def date_header(server_ms):
+    return formatdate(server_ms // 1000, usegmt=True)
+
+
+def feed(clock, skew, start, n, rnd):
+    # n requests against a server whose clock is skew ms ahead; yields after every observation
+    local = start
+    for _ in range(n):
+        rtt = rnd.uniform(5, 60)
+        sent_at = local
+        received_at = local + rtt
+        server_ms = int(sent_at + rnd.uniform(0, rtt) + skew)
+        clock.observe(sent_at, received_at, date_header(server_ms))
+        yield
+        local = received_at + rnd.uniform(0, 700)
+
+
+class ServerClockTest(unittest.TestCase):
+
+    def assert_contains(self, clock, skew):
+        lower, upper = clock.bounds
+        self.assertTrue(lower <= skew < upper, (lower, skew, upper))
+        self.assertTrue(lower <= clock.offset <= upper, (lower, clock.offset, upper))
+
+    def test_bounds_narrow_around_the_skew(self):
+        rnd = random.Random(3)
+        for skew in (1234.5, -2750.0, 40000.0):
+            clock = ServerClock()
+            for _ in feed(clock, skew, 1.6e12, 200, rnd):
+                self.assert_contains(clock, skew)
+            lower, upper = clock.bounds
+            self.assertLess(upper - lower, 60)
+            self.assertLess(abs(clock.offset - skew), 60)
+
+    def test_correct_local_clock_is_left_alone(self):
+        clock = ServerClock()
+        for _ in feed(clock, 0, 1.6e12, 50, random.Random(4)):
+            pass
+        self.assertEqual(clock.offset, 0)
+
+    def test_window_restarts_when_the_skew_moves(self):
+        rnd = random.Random(5)
+        clock = ServerClock(max_age=3600)
+        for _ in feed(clock, 500, 1.6e12, 100, rnd):
+            pass
+        # the local clock jumps: the old bounds no longer intersect and the estimate follows
+        for _ in feed(clock, -3000, 1.6e12 + 100000, 100, rnd):
+            pass
+        self.assert_contains(clock, -3000)
+
+    def test_window_expires_after_max_age(self):
+        clock = ServerClock(max_age=1)
+        clock.observe(0, 10, date_header(5000))
+        started = clock.window_started
+        clock.observe(500, 510, date_header(5500))
+        self.assertEqual(clock.window_started, started)
+        clock.observe(2000, 2010, date_header(7000))
+        self.assertEqual(clock.window_started, 2010)
+
+    def test_missing_or_invalid_date_is_ignored(self):
+        clock = ServerClock()
+        clock.observe(0, 10, None)
+        clock.observe(0, 10, 'not a date')
+        self.assertEqual((clock.samples, clock.offset), (0, 0))
+
+
+class NonceGeneratorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def collect(self, generators, per_thread=300, threads=4):
+        results = []
+        lock = threading.Lock()
+
+        def run(generator):
+            mine = [generator.next() for _ in range(per_thread)]
+            with lock:
+                results.append(mine)
+        workers = [threading.Thread(target=run, args=(generator,))
+                   for generator in generators for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return results
+
+    def assert_unique_and_increasing(self, results):
+        for values in results:
+            self.assertEqual(values, sorted(set(values)))
+        values = [value for values in results for value in values]
+        self.assertEqual(len(values), len(set(values)))
+
+    def test_strictly_increasing_across_threads(self):
+        self.assert_unique_and_increasing(self.collect([NonceGenerator()]))
+
+    def test_shared_file_across_generators(self):
+        path = os.path.join(self.dir, 'nonce')
+        first, second = NonceGenerator(path=path), NonceGenerator(path=path)
+        self.assert_unique_and_increasing(self.collect([first, second]))
+        # alternating calls keep increasing as if one generator made them
+        values = [(first if i % 2 else second).next() for i in range(100)]
+        self.assertEqual(values, sorted(set(values)))
+        with open(path) as f:
+            self.assertEqual(int(f.read()), values[-1])
+
+    def test_follows_the_server_clock(self):
+        clock = ServerClock()
+        clock.offset = 10 ** 9
+        self.assertGreater(NonceGenerator(clock).next(), NonceGenerator().next() + 10 ** 9 - 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import datetime
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from array import array
+from unittest import mock
+
+from python_bitbankcc import downloader
+from python_bitbankcc.downloader import HistoryDownloader, OHLCV_COLUMNS, TRANSACTION_COLUMNS
+from python_bitbankcc.public_api import bitbankcc_public
+
+from .support import Simulator
+
+
+def today():
+    return datetime.date(*time.gmtime()[:3])
+
+
+class HistoryDownloaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sim = Simulator().start()
+        self.pub = bitbankcc_public(self.sim.public_end_point)
+        self.cache_dir = tempfile.mkdtemp()
+        self.downloader = HistoryDownloader(self.pub, self.cache_dir)
+
+    def tearDown(self):
+        self.pub.close()
+        self.sim.stop()
+        shutil.rmtree(self.cache_dir)
+
+    def fetch(self, start, end):
+        before = self.sim.requests
+        values = self.downloader.transactions('btc_jpy', start, end)
+        return values, self.sim.requests - before
+
+    def test_past_periods_are_not_refetched(self):
+        _, requests = self.fetch('20200101', '20200103')
+        self.assertEqual(requests, 3)
+        _, requests = self.fetch('20200101', '20200103')
+        self.assertEqual(requests, 0)
+        _, requests = self.fetch('20200102', '20200104')
+        self.assertEqual(requests, 1)
+
+    def test_current_period_is_refetched(self):
+        yesterday = today() - datetime.timedelta(days=1)
+        _, requests = self.fetch(yesterday, today())
+        self.assertEqual(requests, 2)
+        _, requests = self.fetch(yesterday, today())
+        self.assertEqual(requests, 1)
+
+    def test_yearly_candles_are_cached_by_year(self):
+        before = self.sim.requests
+        self.downloader.candlestick('btc_jpy', '1day', '20180601', '20190101')
+        self.downloader.candlestick('btc_jpy', '1day', '20180101', '20191231')
+        self.assertEqual(self.sim.requests - before, 2)
+
+    def test_array_path(self):
+        with mock.patch.object(downloader, 'numpy', None):
+            values, _ = self.fetch('20200101', '20200102')
+            self.assertIsInstance(values, array)
+            self.assertEqual(len(values), 2 * 60 * len(TRANSACTION_COLUMNS))
+            self.assertEqual(list(values[:3]), [0.0, -1.0, 5000000.0])
+            candles = self.downloader.candlestick('btc_jpy', '1hour', '20200101', '20200101')
+            self.assertEqual(list(candles[:5]), [5000000.0, 5010000.0, 4990000.0, 5005000.0, 1.2345])
+            path = self.downloader.transactions_paths('btc_jpy', '20200101', '20200101')[0]
+            with self.assertRaises(ImportError):
+                self.downloader.memmap(path, len(TRANSACTION_COLUMNS))
+
+    @unittest.skipIf(downloader.numpy is None, 'numpy is not installed')
+    def test_numpy_path(self):
+        values, _ = self.fetch('20200101', '20200102')
+        self.assertEqual(values.shape, (2 * 60, len(TRANSACTION_COLUMNS)))
+        self.assertEqual(list(values[1, :3]), [1.0, 1.0, 5000000.0])
+        candles = self.downloader.candlestick('btc_jpy', '1hour', '20200101', '20200101')
+        self.assertEqual(candles.shape, (24, len(OHLCV_COLUMNS)))
+        path = self.downloader.transactions_paths('btc_jpy', '20200101', '20200101')[0]
+        view = self.downloader.memmap(path, len(TRANSACTION_COLUMNS))
+        self.assertEqual(view.shape, (60, len(TRANSACTION_COLUMNS)))
+        self.assertEqual(list(view[:, 0]), list(values[:60, 0]))
+        self.assertEqual(os.path.getsize(path), 60 * len(TRANSACTION_COLUMNS) * 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
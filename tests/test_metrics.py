@@ -0,0 +1,79 @@
+import unittest
+
+from python_bitbankcc.metrics import LatencyHistogram, RequestEvent, notify
+from python_bitbankcc.private_api import bitbankcc_private
+from python_bitbankcc.utils import BitbankClientError
+
+from .support import Simulator, private_config
+
+
+def event(seconds, method='GET', endpoint='/user/assets', error=None):
+    e = RequestEvent(method, endpoint)
+    e.total_time = seconds
+    e.error = error
+    return e
+
+
+class LatencyHistogramTest(unittest.TestCase):
+
+    def test_quantiles_are_within_one_bucket(self):
+        histogram = LatencyHistogram()
+        for i in range(1, 1001):
+            histogram(event(i / 1000.0))
+        for q, expected in ((0.5, 0.5), (0.99, 0.99)):
+            value = histogram.quantile('GET /user/assets', q)
+            self.assertTrue(expected <= value <= expected * LatencyHistogram.GROWTH, (q, value))
+        snapshot = histogram.snapshot()['GET /user/assets']
+        self.assertEqual((snapshot['count'], snapshot['max']), (1000, 1.0))
+        self.assertAlmostEqual(snapshot['mean'], 0.5005)
+        self.assertIsNone(histogram.quantile('GET /user/spot/order', 0.5))
+
+    def test_errors_are_counted(self):
+        histogram = LatencyHistogram()
+        histogram(event(0.01))
+        histogram(event(0.02, error=BitbankClientError('failed', 10005)))
+        self.assertEqual(histogram.snapshot()['GET /user/assets']['errors'], 1)
+        histogram.reset()
+        self.assertEqual(histogram.snapshot(), {})
+
+    def test_failing_observer_does_not_stop_the_others(self):
+        seen = []
+        notify([lambda e: 1 / 0, seen.append], event(0.01))
+        self.assertEqual(len(seen), 1)
+
+
+class RequestEventTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sim = Simulator().start()
+        self.histogram = LatencyHistogram()
+        self.events = []
+        self.prv = bitbankcc_private(self.sim.api_key, self.sim.api_secret,
+                                     config=private_config(self.sim, observers=(self.histogram, self.events.append)))
+
+    def tearDown(self):
+        self.prv.close()
+        self.sim.stop()
+
+    def test_order_placement_and_query_are_kept_apart(self):
+        for _ in range(3):
+            order = self.prv.order('btc_jpy', '100', '1', 'buy', 'limit')
+            self.prv.get_order('btc_jpy', order['order_id'])
+        snapshot = self.histogram.snapshot()
+        self.assertEqual(sorted(snapshot), ['GET /user/spot/order', 'POST /user/spot/order'])
+        self.assertEqual([stats['count'] for stats in snapshot.values()], [3, 3])
+        last = self.events[-1]
+        self.assertEqual((last.method, last.status, last.error), ('GET', 200, None))
+        self.assertGreater(last.bytes_received, 0)
+        self.assertGreaterEqual(last.total_time, last.wait_time + last.read_time)
+
+    def test_api_error_is_recorded(self):
+        self.sim.forced_errors['/v1/user/assets'] = 20001
+        with self.assertRaises(BitbankClientError):
+            self.prv.get_asset()
+        self.assertEqual(self.events[-1].error_code, 20001)
+        self.assertEqual(self.histogram.snapshot()['GET /user/assets']['errors'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from decimal import Decimal
+
+from python_bitbankcc.models import Depth, Trade, Transactions, to_scaled
+
+
+TRANSACTIONS = {'transactions': [
+    {'transaction_id': 1, 'side': 'buy', 'price': '0.1234', 'amount': '100', 'executed_at': 10},
+    {'transaction_id': 2, 'side': 'sell', 'price': '0.1234', 'amount': '0.00000001', 'executed_at': 11},
+]}
+
+
+class ModelTest(unittest.TestCase):
+
+    def test_to_scaled_is_exact(self):
+        self.assertEqual(to_scaled(['0.1', '12', '0.00000003']), (to_scaled(['10000000', '1200000000', '3'])[0], 8))
+        self.assertEqual(to_scaled([]), (to_scaled([])[0], 0))
+
+    def test_depth(self):
+        depth = Depth.from_dict({'asks': [['0.0301', '1.5']], 'bids': [['0.03', '20000000.12345678']],
+                                 'timestamp': 1, 'sequenceId': '9'})
+        self.assertEqual(depth.ask(0), (Decimal('0.0301'), Decimal('1.5')))
+        self.assertEqual(depth.bid(0), (Decimal('0.03'), Decimal('20000000.12345678')))
+        self.assertEqual((len(depth), depth.sequence_id), (2, 9))
+
+    def test_transactions_round_trip(self):
+        columns = Transactions.from_dict(TRANSACTIONS)
+        self.assertEqual([columns[i] for i in range(len(columns))], Trade.from_transactions(TRANSACTIONS))
+
+    def test_from_list_shares_repeated_values(self):
+        trades = Trade.from_transactions(TRANSACTIONS)
+        self.assertIs(trades[0].price, trades[1].price)
+        self.assertEqual(trades[1].amount, Decimal('0.00000001'))
+
+
+if __name__ == '__main__':
+    unittest.main()
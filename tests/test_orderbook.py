@@ -0,0 +1,65 @@
+import random
+import unittest
+from decimal import Decimal
+
+from python_bitbankcc.orderbook import OrderBook
+
+
+def naive_through(levels, price, descending):
+    price = Decimal(price)
+    return sum((a for p, a in levels.items() if (p >= price if descending else p <= price)), Decimal(0))
+
+def naive_vwap(levels, amount, descending):
+    amount = Decimal(amount)
+    filled = notional = Decimal(0)
+    for price in sorted(levels, reverse=descending):
+        take = min(levels[price], amount - filled)
+        filled += take
+        notional += take * price
+        if filled == amount:
+            break
+    return (notional / filled if filled else None), filled
+
+
+class OrderBookTest(unittest.TestCase):
+
+    def test_queries_match_a_full_scan_while_diffs_are_applied(self):
+        rnd = random.Random(7)
+        book = OrderBook({'asks': [['100.5', '1']], 'bids': [['99.5', '2']], 'sequenceId': '1'})
+        asks = {Decimal('100.5'): Decimal(1)}
+        bids = {Decimal('99.5'): Decimal(2)}
+        for sequence in range(2, 400):
+            # prices drift far enough and get finer ticks to force the trees to be rebuilt
+            tick = Decimal('0.001') if sequence > 200 else Decimal('0.5')
+            ask = Decimal(100 + rnd.randint(0, 400)) * Decimal('0.5') + 50 + tick * rnd.randint(0, 3)
+            bid = Decimal(100 - rnd.randint(0, 400)) * Decimal('0.5') + 50 - tick * rnd.randint(0, 3)
+            ask_amount = Decimal(rnd.choice(['0', '0.1', '1.25', '3']))
+            bid_amount = Decimal(rnd.choice(['0', '0.2', '2', '5']))
+            for levels, price, amount in ((asks, ask, ask_amount), (bids, bid, bid_amount)):
+                if amount:
+                    levels[price] = amount
+                else:
+                    levels.pop(price, None)
+            book.apply_diff({'a': [[str(ask), str(ask_amount)]], 'b': [[str(bid), str(bid_amount)]],
+                             's': str(sequence)})
+            probe = Decimal(rnd.randint(0, 400)) / 2
+            size = Decimal(rnd.randint(1, 40)) / 4
+            self.assertEqual(book.asks.amount_through(probe), naive_through(asks, probe, False))
+            self.assertEqual(book.bids.amount_through(probe), naive_through(bids, probe, True))
+            self.assertEqual(book.vwap('buy', size), naive_vwap(asks, size, False))
+            self.assertEqual(book.vwap('sell', size), naive_vwap(bids, size, True))
+        self.assertEqual([p for p, _ in book.asks], sorted(asks))
+        self.assertEqual([p for p, _ in book.bids], sorted(bids, reverse=True))
+
+    def test_diff_round_trip(self):
+        old = OrderBook({'asks': [['101', '1'], ['102', '2']], 'bids': [['99', '1']], 'sequenceId': '1'})
+        new = OrderBook({'asks': [['101', '3']], 'bids': [['99', '1'], ['98', '4']], 'sequenceId': '2'})
+        old.apply_diff(old.diff(new))
+        self.assertEqual(old.to_depth(), new.to_depth())
+        self.assertEqual(old.bids.amount_through('98'), Decimal(5))
+        self.assertEqual(old.vwap('buy', '1'), (Decimal(101), Decimal(1)))
+        self.assertEqual(old.vwap('buy', '0'), (None, Decimal(0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+from python_bitbankcc.orders import OrderTracker
+from python_bitbankcc.private_api import bitbankcc_private
+from python_bitbankcc.stream import RESYNC
+from python_bitbankcc.utils import BitbankClientError
+
+from .support import Simulator, private_config
+
+
+class OrderTrackerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sim = Simulator().start()
+        self.prv = bitbankcc_private(self.sim.api_key, self.sim.api_secret, config=private_config(self.sim))
+        self.tracker = OrderTracker(self.prv, ['btc_jpy'], reconcile_interval=None)
+
+    def tearDown(self):
+        self.tracker.stop()
+        self.prv.close()
+        self.sim.stop()
+
+    def place(self, price='100'):
+        return self.prv.order('btc_jpy', price, '1', 'buy', 'limit')
+
+    def test_seed_and_order(self):
+        seeded = self.place()
+        self.tracker.seed()
+        placed = self.tracker.order('btc_jpy', '101', '1', 'buy', 'limit')
+        self.assertEqual(self.tracker.status(seeded['order_id']), 'UNFILLED')
+        self.assertTrue(self.tracker.is_active(placed['order_id']))
+        self.assertEqual(len(self.tracker.active_orders('btc_jpy')), 2)
+
+    def test_reconcile_finds_orders_finished_elsewhere(self):
+        order = self.place()
+        self.tracker.seed()
+        self.prv.cancel_order('btc_jpy', order['order_id'])
+        self.assertEqual(self.tracker.reconcile(), 1)
+        self.assertEqual(self.tracker.status(order['order_id']), 'CANCELED_UNFILLED')
+        self.assertEqual(self.tracker.active_orders(), [])
+
+    def test_failed_cancel_marks_order_stale(self):
+        order = self.tracker.order('btc_jpy', '100', '1', 'buy', 'limit')
+        self.prv.cancel_order('btc_jpy', order['order_id'])
+        with self.assertRaises(BitbankClientError):
+            self.tracker.cancel_order('btc_jpy', order['order_id'])
+        self.assertTrue(self.tracker.is_stale(order['order_id']))
+        self.tracker.reconcile()
+        self.assertFalse(self.tracker.is_stale(order['order_id']))
+        self.assertEqual(self.tracker.status(order['order_id']), 'CANCELED_UNFILLED')
+
+    def test_cancel_orders(self):
+        orders = [self.tracker.order('btc_jpy', str(100 + i), '1', 'buy', 'limit') for i in range(3)]
+        self.prv.cancel_order('btc_jpy', orders[0]['order_id'])
+        self.tracker.cancel_orders('btc_jpy', [order['order_id'] for order in orders])
+        # the first one is left out of the response and stays stale until reconciled
+        self.assertEqual([order['order_id'] for order in self.tracker.active_orders()], [orders[0]['order_id']])
+        self.assertTrue(self.tracker.is_stale(orders[0]['order_id']))
+        self.tracker.reconcile()
+        self.assertEqual(self.tracker.active_orders(), [])
+
+    def test_stream_updates_only_move_forward(self):
+        order = self.tracker.order('btc_jpy', '100', '1', 'buy', 'limit')
+        self.tracker.on_message('spot_order', [dict(order, status='PARTIALLY_FILLED', executed_amount='0.5')])
+        self.tracker.on_message('spot_order', [dict(order, status='UNFILLED', executed_amount='0')])
+        self.assertEqual(self.tracker.status(order['order_id']), 'PARTIALLY_FILLED')
+        self.tracker.on_message('spot_order', [dict(order, status='FULLY_FILLED', executed_amount='1')])
+        self.assertFalse(self.tracker.is_active(order['order_id']))
+
+    def test_invalidation_and_resync(self):
+        order = self.tracker.order('btc_jpy', '100', '1', 'buy', 'limit')
+        self.tracker.on_message('spot_order_invalidation', {'order_id': [order['order_id']]})
+        self.assertTrue(self.tracker.is_stale(order['order_id']))
+        self.prv.cancel_order('btc_jpy', order['order_id'])
+        self.tracker.on_message(RESYNC, ['channel'])
+        self.assertEqual(self.tracker.status(order['order_id']), 'CANCELED_UNFILLED')
+        self.assertFalse(self.tracker.is_stale(order['order_id']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+
+from python_bitbankcc.async_api import iter_history_async, bitbankcc_async_private
+from python_bitbankcc.pagination import iter_history, MAX_TRANSFER_PAGE_SIZE
+from python_bitbankcc.private_api import bitbankcc_private
+from python_bitbankcc.utils import BitbankClientError
+
+from .support import Simulator, private_config
+
+
+RECORDS = [{'id': i, 'at': 1000 + i // 3} for i in range(12)]  # 3 records per millisecond
+
+
+def fetch(since, end, count):
+    return [r for r in RECORDS if since is None or r['at'] >= since][:count]
+
+async def fetch_async(since, end, count):
+    return fetch(since, end, count)
+
+async def collect(records):
+    return [record async for record in records]
+
+
+class IterHistoryTest(unittest.TestCase):
+
+    def test_boundary_records_are_not_repeated(self):
+        for prefetch in (False, True):
+            ids = [r['id'] for r in iter_history(fetch, 'id', 'at', count=4, prefetch=prefetch)]
+            self.assertEqual(ids, list(range(12)))
+
+    def test_full_page_within_one_millisecond_raises(self):
+        with self.assertRaises(BitbankClientError):
+            list(iter_history(fetch, 'id', 'at', count=2))
+
+    def test_async(self):
+        for prefetch in (False, True):
+            records = asyncio.run(collect(iter_history_async(fetch_async, 'id', 'at', count=4, prefetch=prefetch)))
+            self.assertEqual([r['id'] for r in records], list(range(12)))
+        with self.assertRaises(BitbankClientError):
+            asyncio.run(collect(iter_history_async(fetch_async, 'id', 'at', count=2)))
+
+
+class PrivateIteratorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sim = Simulator().start()
+
+    def tearDown(self):
+        self.sim.stop()
+
+    def test_transfer_history_page_size(self):
+        counts = []
+        class recording_private(bitbankcc_private):
+            def _get_query(self, path, query):
+                counts.append((path, query.get('count')))
+                return super(recording_private, self)._get_query(path, query)
+        with recording_private(self.sim.api_key, self.sim.api_secret, config=private_config(self.sim)) as prv:
+            list(prv.iter_deposit_history())
+            list(prv.iter_withdraw_history())
+        self.assertEqual(counts, [('/user/deposit_history', MAX_TRANSFER_PAGE_SIZE),
+                                  ('/user/withdrawal_history', MAX_TRANSFER_PAGE_SIZE)])
+
+    def test_async_private_iterators(self):
+        async def main():
+            async with bitbankcc_async_private(self.sim.api_key, self.sim.api_secret,
+                                               config=private_config(self.sim)) as prv:
+                return (await collect(prv.iter_trade_history('btc_jpy')),
+                        await collect(prv.iter_deposit_history()))
+        self.assertEqual(asyncio.run(main()), ([], []))
+
+
+if __name__ == '__main__':
+    unittest.main()
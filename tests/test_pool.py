@@ -0,0 +1,61 @@
+import unittest
+
+from python_bitbankcc.cache import TTLCache
+from python_bitbankcc.pool import bitbankcc_private_pool
+from python_bitbankcc.utils import BitbankClientError
+
+from .support import Simulator, private_config
+
+
+def jpy(assets):
+    return assets['assets'][0]['onhand_amount']
+
+
+class PrivatePoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sim = Simulator().start()
+        self.sim.add_account('key-b', 'secret-b', jpy='2000')
+        self.sim.add_account('key-c', 'secret-c', jpy='3000')
+        accounts = {'a': (self.sim.api_key, self.sim.api_secret), 'b': ('key-b', 'secret-b'),
+                    'c': ('key-c', 'wrong-secret')}
+        self.pool = bitbankcc_private_pool(accounts, private_config(self.sim, cache=TTLCache()))
+
+    def tearDown(self):
+        self.pool.close()
+        self.sim.stop()
+
+    def test_calls_are_routed_to_their_account(self):
+        self.assertEqual(jpy(self.pool.call('b', 'get_asset')), '2000')
+        self.assertEqual(jpy(self.pool['a'].get_asset()), '1000000')
+        order = self.pool['b'].order('btc_jpy', '100', '1', 'buy', 'limit')
+        self.assertEqual(self.sim.accounts['key-b'][1].active('btc_jpy')[0]['order_id'], order['order_id'])
+        self.assertEqual(self.sim.exchange.active('btc_jpy'), [])
+
+    def test_caches_are_per_account(self):
+        self.assertIsNot(self.pool['a'].cache, self.pool['b'].cache)
+        for _ in range(2):
+            results = self.pool.map('get_asset', accounts=['a', 'b'])
+            self.assertEqual(dict((name, jpy(result)) for name, result in results.items()),
+                             {'a': '1000000', 'b': '2000'})
+
+    def test_map_selected_accounts(self):
+        self.assertEqual(list(self.pool.map('get_asset', accounts=['b'])), ['b'])
+        self.assertEqual(list(self.pool.map('get_asset')), ['a', 'b', 'c'])
+
+    def test_failed_account_is_reported_under_errors(self):
+        self.pool['a'].order('btc_jpy', '100', '1', 'buy', 'limit')
+        self.pool['b'].order('btc_jpy', '101', '1', 'buy', 'limit')
+        result = self.pool.get_active_orders_all('btc_jpy')
+        self.assertEqual(sorted((o['account'], o['price']) for o in result['orders']), [('a', '100'), ('b', '101')])
+        self.assertEqual(list(result['errors']), ['c'])
+        self.assertIsInstance(result['errors']['c'], BitbankClientError)
+        self.assertEqual(result['errors']['c'].code, 20001)
+
+    def test_accounts_share_one_connection_pool(self):
+        self.assertTrue(all(self.pool[name].session is self.pool.session for name in self.pool))
+        self.assertEqual(self.pool.pool_size, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
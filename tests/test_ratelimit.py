@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from python_bitbankcc.ratelimit import (TokenBucket, RateLimiter, classify_endpoint,
+                                        PRIORITY_CANCEL, PRIORITY_ORDER, PRIORITY_QUERY)
+
+
+def wait_for_queue(bucket, depth, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while bucket.metrics()['queue_depth'] < depth:
+        if time.monotonic() > deadline:
+            raise AssertionError('queue never reached %d' % depth)
+        time.sleep(0.001)
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_cancel_overtakes_queued_orders(self):
+        bucket = TokenBucket(rate=20, capacity=1)
+        bucket.acquire()
+        served = []
+        lock = threading.Lock()
+
+        def waiter(name, priority):
+            bucket.acquire(priority)
+            with lock:
+                served.append(name)
+
+        threads = []
+        for depth, (name, priority) in enumerate([('order1', PRIORITY_ORDER), ('order2', PRIORITY_ORDER),
+                                                  ('cancel', PRIORITY_CANCEL)], 1):
+            thread = threading.Thread(target=waiter, args=(name, priority))
+            thread.start()
+            threads.append(thread)
+            wait_for_queue(bucket, depth)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(served, ['cancel', 'order1', 'order2'])
+
+    def test_rate_is_enforced_for_threads(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+        started = time.monotonic()
+        for _ in range(11):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 10 / 50.0 * 0.9)
+
+    def test_rate_is_enforced_for_tasks(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+
+        async def main():
+            started = time.monotonic()
+            await asyncio.gather(*[bucket.acquire_async() for _ in range(11)])
+            return time.monotonic() - started
+        self.assertGreaterEqual(asyncio.run(main()), 10 / 50.0 * 0.9)
+
+    def test_threads_and_tasks_share_the_bucket(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+        started = time.monotonic()
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+
+        async def main():
+            await asyncio.gather(*[bucket.acquire_async() for _ in range(6)])
+        asyncio.run(main())
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.monotonic() - started, 10 / 50.0 * 0.9)
+        self.assertEqual(bucket.metrics()['acquired'], 11)
+
+    def test_cancelled_task_does_not_block_later_waiters(self):
+        bucket = TokenBucket(rate=10, capacity=1)
+        bucket.acquire()
+
+        async def main():
+            first = asyncio.ensure_future(bucket.acquire_async(PRIORITY_CANCEL))
+            second = asyncio.ensure_future(bucket.acquire_async(PRIORITY_QUERY))
+            await asyncio.sleep(0.01)
+            self.assertEqual(bucket.metrics()['queue_depth'], 2)
+            first.cancel()
+            started = time.monotonic()
+            await asyncio.wait_for(second, 1.0)
+            return time.monotonic() - started
+        self.assertLess(asyncio.run(main()), 0.5)
+        self.assertEqual(bucket.metrics()['queue_depth'], 0)
+
+    def test_metrics(self):
+        bucket = TokenBucket(rate=100, capacity=2)
+        for _ in range(4):
+            bucket.acquire()
+        metrics = bucket.metrics()
+        self.assertEqual((metrics['acquired'], metrics['waited'], metrics['queue_depth']), (4, 2, 0))
+        self.assertGreater(metrics['wait_time_max'], 0)
+        self.assertGreaterEqual(metrics['wait_time_total'], metrics['wait_time_max'])
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def test_lanes(self):
+        self.assertEqual(classify_endpoint('POST', '/user/spot/cancel_orders'), ('update', PRIORITY_CANCEL))
+        self.assertEqual(classify_endpoint('POST', '/user/spot/order'), ('update', PRIORITY_ORDER))
+        self.assertEqual(classify_endpoint('GET', '/user/spot/order'), ('query', PRIORITY_QUERY))
+        self.assertEqual(classify_endpoint('POST', '/user/spot/orders_info'), ('query', PRIORITY_QUERY))
+
+    def test_buckets_are_separate(self):
+        limiter = RateLimiter({'query': (1000, 5), 'update': (1000, 1)})
+        for _ in range(3):
+            limiter.acquire('GET', '/user/assets')
+        limiter.acquire('POST', '/user/spot/order')
+        metrics = limiter.metrics()
+        self.assertEqual((metrics['query']['acquired'], metrics['update']['acquired']), (3, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
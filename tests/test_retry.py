@@ -0,0 +1,93 @@
+import asyncio
+import unittest
+
+from python_bitbankcc.async_api import bitbankcc_async_private
+from python_bitbankcc.private_api import bitbankcc_private
+from python_bitbankcc.retry import RetryPolicy
+from python_bitbankcc.utils import BitbankClientError
+
+from .support import Simulator, private_config
+
+
+class RetryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sim = Simulator().start()
+        policy = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.01)
+        self.prv = bitbankcc_private(self.sim.api_key, self.sim.api_secret,
+                                     config=private_config(self.sim, retry_policy=policy))
+
+    def tearDown(self):
+        self.prv.close()
+        self.sim.stop()
+
+    def call(self, path, code, fn):
+        self.sim.forced_errors['/v1' + path] = code
+        self.sim.requests = 0
+        with self.assertRaises(BitbankClientError) as raised:
+            fn()
+        self.assertEqual(raised.exception.code, code)
+        return self.sim.requests
+
+    def test_retryable_read_is_retried(self):
+        self.assertEqual(self.call('/user/assets', 10005, self.prv.get_asset), 3)
+
+    def test_final_error_is_not_retried(self):
+        self.assertEqual(self.call('/user/assets', 20001, self.prv.get_asset), 1)
+
+    def test_order_is_only_retried_when_rejected_up_front(self):
+        order = lambda: self.prv.order('btc_jpy', '100', '1', 'buy', 'limit')
+        self.assertEqual(self.call('/user/spot/order', 70011, order), 3)
+        self.assertEqual(self.call('/user/spot/order', 10005, order), 1)
+
+
+
+class TransportRetryTest(unittest.TestCase):
+    # 5xx answers and dropped connections, through the sync and the asyncio client
+
+    def setUp(self):
+        self.sim = Simulator().start()
+        self.config = private_config(self.sim, retry_policy=RetryPolicy(max_attempts=3, base_delay=0.001,
+                                                                         max_delay=0.01))
+
+    def tearDown(self):
+        self.sim.stop()
+
+    def count(self, call):
+        self.sim.requests = 0
+        with self.assertRaises(Exception):
+            call()
+        return self.sim.requests
+
+    def sync(self, method, *args):
+        def call():
+            with bitbankcc_private(self.sim.api_key, self.sim.api_secret, config=self.config) as prv:
+                return getattr(prv, method)(*args)
+        return call
+
+    def run_async(self, method, *args):
+        async def main():
+            async with bitbankcc_async_private(self.sim.api_key, self.sim.api_secret, config=self.config) as prv:
+                return await getattr(prv, method)(*args)
+        return lambda: asyncio.run(main())
+
+    def test_server_error_is_retried_for_reads_only(self):
+        self.sim.forced_statuses['/v1/user/assets'] = 503
+        self.sim.forced_statuses['/v1/user/spot/order'] = 503
+        order = ('order', 'btc_jpy', '100', '1', 'buy', 'limit')
+        for client in (self.sync, self.run_async):
+            self.assertEqual(self.count(client('get_asset')), 3)
+            self.assertEqual(self.count(client(*order)), 1)
+
+    def test_dropped_connection_is_retried_for_reads_only(self):
+        self.sim.dropped_paths.update(['/v1/user/assets', '/v1/user/spot/order'])
+        order = ('order', 'btc_jpy', '100', '1', 'buy', 'limit')
+        self.assertEqual(self.count(self.sync('get_asset')), 3)
+        # aiohttp itself sends a GET once more when the server drops the connection
+        self.assertEqual(self.count(self.run_async('get_asset')), 6)
+        for client in (self.sync, self.run_async):
+            self.assertEqual(self.count(client(*order)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
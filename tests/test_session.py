@@ -0,0 +1,70 @@
+import unittest
+
+from python_bitbankcc.pool import bitbankcc_private_pool
+from python_bitbankcc.private_api import bitbankcc_private
+from python_bitbankcc.public_api import bitbankcc_public
+from python_bitbankcc.transport import HttpClientTransport
+
+from .support import Simulator, private_config
+
+
+class CountingTransport(HttpClientTransport):
+
+    def __init__(self):
+        super(CountingTransport, self).__init__(pool_size=2)
+        self.closed = 0
+
+    def close(self):
+        self.closed += 1
+        super(CountingTransport, self).close()
+
+
+class SessionLifecycleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sim = Simulator().start()
+
+    def tearDown(self):
+        self.sim.stop()
+
+    def test_owned_pool_is_closed(self):
+        transport = CountingTransport()
+        with bitbankcc_public(self.sim.public_end_point, config={'transport': transport}) as pub:
+            pub.get_ticker('btc_jpy')
+            self.assertTrue(pub._owns_session)
+            self.assertEqual(transport.closed, 0)
+        self.assertEqual(transport.closed, 1)
+        prv = bitbankcc_private(self.sim.api_key, self.sim.api_secret, config=private_config(self.sim, transport=transport))
+        prv.close()
+        self.assertEqual(transport.closed, 2)
+
+    def test_caller_session_is_left_open(self):
+        transport = CountingTransport()
+        with bitbankcc_public(self.sim.public_end_point, session=transport) as pub:
+            self.assertFalse(pub._owns_session)
+        prv = bitbankcc_private(self.sim.api_key, self.sim.api_secret, config=private_config(self.sim), session=transport)
+        prv.close()
+        self.assertEqual(transport.closed, 0)
+        prv.get_asset()
+        self.assertIs(prv.session, transport)
+
+    def test_pool_closes_its_shared_session(self):
+        transport = CountingTransport()
+        accounts = {'a': (self.sim.api_key, self.sim.api_secret)}
+        with bitbankcc_private_pool(accounts, private_config(self.sim, transport=transport)) as pool:
+            pool['a'].close()
+            self.assertEqual(transport.closed, 0)
+        self.assertEqual(transport.closed, 1)
+
+    def test_observers(self):
+        events = []
+        with bitbankcc_public(self.sim.public_end_point) as pub:
+            pub.add_observer(events.append)
+            pub.get_ticker('btc_jpy')
+            pub.remove_observer(events.append)
+            pub.get_ticker('btc_jpy')
+        self.assertEqual([event.endpoint for event in events], ['/btc_jpy/ticker'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,258 @@
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+import unittest
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlsplit, parse_qs
+
+from python_bitbankcc.stream import PublicStream, PrivateStream, RESYNC
+
+WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+class WebSocketConnection(object):
+    # the server side of one RFC 6455 connection, text frames only
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.file = sock.makefile('rb')
+        key = None
+        while True:
+            line = self.file.readline().decode().strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            if name.lower() == 'sec-websocket-key':
+                key = value.strip()
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        sock.sendall(('HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+                      'Sec-WebSocket-Accept: %s\r\n\r\n' % accept).encode())
+
+    def send(self, text):
+        data = text.encode()
+        if len(data) < 126:
+            header = struct.pack('!BB', 0x81, len(data))
+        else:
+            header = struct.pack('!BBH', 0x81, 126, len(data))
+        self.sock.sendall(header + data)
+
+    def recv(self):
+        first, second = struct.unpack('!BB', self.file.read(2))
+        length = second & 0x7f
+        if length == 126:
+            length = struct.unpack('!H', self.file.read(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', self.file.read(8))[0]
+        mask = self.file.read(4)
+        payload = bytearray(self.file.read(length))
+        for i in range(length):
+            payload[i] ^= mask[i % 4]
+        if first & 0x0f == 0x8:
+            # answer the close handshake so the client does not wait for it
+            self.sock.sendall(struct.pack('!BB', 0x88, len(payload)) + bytes(payload))
+            return None
+        return payload.decode()
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+class SocketIOStandIn(object):
+    # a local stand-in for stream.bitbank.cc: every accepted connection is handed to script(conn, n)
+
+    def __init__(self, script):
+        self.script = script
+        self.sock = socket.socket()
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(4)
+        self.end_point = 'ws://127.0.0.1:%d/socket.io/?EIO=4&transport=websocket' % self.sock.getsockname()[1]
+        self.errors = []
+        thread = threading.Thread(target=self._accept)
+        thread.daemon = True
+        thread.start()
+
+    def _accept(self):
+        n = 0
+        while True:
+            try:
+                sock, _ = self.sock.accept()
+            except OSError:
+                return
+            conn = WebSocketConnection(sock)
+            try:
+                self.script(conn, n)
+            except Exception as e:
+                self.errors.append(e)
+            conn.close()
+            n += 1
+
+    def close(self):
+        self.sock.close()
+
+
+def message(room, data):
+    return '42' + json.dumps(['message', {'room_name': room, 'message': {'data': data}}])
+
+
+class PublicStreamTest(unittest.TestCase):
+
+    def test_handshake_ping_join_and_resync(self):
+        rooms = ['ticker_btc_jpy', 'depth_diff_btc_jpy']
+        received = []
+
+        def script(conn, n):
+            conn.send('0' + json.dumps({'sid': 'sid%d' % n, 'upgrades': [], 'pingInterval': 25000,
+                                        'pingTimeout': 20000}))
+            received.append([conn.recv() for _ in range(3)])
+            conn.send('2')
+            received.append(conn.recv())
+            conn.send(message('ticker_btc_jpy', {'last': str(n)}))
+            # the first connection is dropped without a close frame, the second one waits for stop()
+            if n > 0:
+                conn.recv()
+
+        server = SocketIOStandIn(script)
+        stream = PublicStream(rooms, end_point=server.end_point, reconnect_delay=0.01).start()
+        try:
+            messages = stream.messages(timeout=5)
+            self.assertEqual(next(messages), ('ticker_btc_jpy', {'last': '0'}))
+            self.assertEqual(next(messages), (RESYNC, rooms))
+            self.assertEqual(next(messages), ('ticker_btc_jpy', {'last': '1'}))
+        finally:
+            stream.stop()
+            server.close()
+        joins = ['40'] + ['42' + json.dumps(['join-room', room]) for room in rooms]
+        self.assertEqual(received[:4], [joins, '3', joins, '3'])
+        self.assertEqual(server.errors, [])
+
+
+class PubNubStandIn(ThreadingMixIn, HTTPServer):
+    # answers /v2/subscribe long polls from a list of (status, body) and records the query strings
+    daemon_threads = True
+
+    def __init__(self, responses):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), PubNubHandler)
+        self.responses = list(responses)
+        self.queries = []
+        self.done = threading.Event()
+        thread = threading.Thread(target=self.serve_forever, kwargs={'poll_interval': 0.05})
+        thread.daemon = True
+        thread.start()
+
+    @property
+    def end_point(self):
+        return 'http://%s:%d' % self.server_address[:2]
+
+
+class PubNubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        self.server.queries.append((url.path, dict((k, v[0]) for k, v in parse_qs(url.query).items())))
+        if self.server.responses:
+            status, body = self.server.responses.pop(0)
+        else:
+            self.server.done.set()
+            status, body = 200, {'t': {'t': '999', 'r': 4}, 'm': []}
+            self.server.done.wait(0.2)
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class SubscribeClient(object):
+    # stands in for bitbankcc_private; every get_subscribe hands out a new token
+
+    def __init__(self):
+        self.tokens = 0
+
+    def get_subscribe(self):
+        self.tokens += 1
+        return {'pubnub_channel': 'user-channel', 'pubnub_token': 'token%d' % self.tokens}
+
+
+class PrivateStreamTest(unittest.TestCase):
+
+    def test_timetoken_carry_over_and_token_refresh(self):
+        order = {'order_id': 1, 'pair': 'btc_jpy', 'status': 'UNFILLED'}
+        server = PubNubStandIn([
+            (200, {'t': {'t': '100', 'r': 4}, 'm': []}),
+            (200, {'t': {'t': '101', 'r': 4}, 'm': [{'c': 'user-channel', 'd': {'method': 'spot_order_new',
+                                                                                 'params': [order]}}]}),
+            (403, {'error': True}),
+            (200, {'t': {'t': '102', 'r': 4}, 'm': [{'c': 'user-channel', 'd': {'method': 'spot_order',
+                                                                                 'params': [order]}}]}),
+        ])
+        client = SubscribeClient()
+        stream = PrivateStream(client, end_point=server.end_point, subscribe_key='sub-key',
+                               reconnect_delay=0.01).start()
+        try:
+            messages = stream.messages(timeout=5)
+            self.assertEqual(next(messages), ('spot_order_new', [order]))
+            self.assertEqual(next(messages), (RESYNC, ['user-channel']))
+            self.assertEqual(next(messages), ('spot_order', [order]))
+            server.done.wait(5)
+        finally:
+            stream.stop()
+            server.shutdown()
+            server.server_close()
+        paths = set(path for path, _ in server.queries)
+        self.assertEqual(paths, set(['/v2/subscribe/sub-key/user-channel/0']))
+        queries = [(q['tt'], q.get('tr'), q['auth']) for _, q in server.queries[:5]]
+        self.assertEqual(queries, [
+            ('0', None, 'token1'),
+            ('100', '4', 'token1'),
+            ('101', '4', 'token1'),
+            # the 403 reconnects with a fresh token and resumes from the last timetoken
+            ('101', '4', 'token2'),
+            ('102', '4', 'token2'),
+        ])
+        self.assertEqual(client.tokens, 2)
+
+    def test_failing_callback_does_not_replay_messages(self):
+        order = {'order_id': 1, 'pair': 'btc_jpy', 'status': 'UNFILLED'}
+        server = PubNubStandIn([
+            (200, {'t': {'t': '100', 'r': 4}, 'm': [{'c': 'user-channel', 'd': {'method': 'spot_order_new',
+                                                                                 'params': [order]}}]}),
+            (200, {'t': {'t': '101', 'r': 4}, 'm': [{'c': 'user-channel', 'd': {'method': 'spot_order',
+                                                                                 'params': [order]}}]}),
+        ])
+        received = []
+        delivered = threading.Event()
+
+        def on_message(method, params):
+            received.append(method)
+            if method == 'spot_order_new':
+                raise ValueError('consumer bug')
+            delivered.set()
+
+        client = SubscribeClient()
+        stream = PrivateStream(client, end_point=server.end_point, subscribe_key='sub-key',
+                               on_message=on_message, reconnect_delay=0.01).start()
+        try:
+            self.assertTrue(delivered.wait(5))
+            server.done.wait(5)
+        finally:
+            stream.stop()
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(received, ['spot_order_new', 'spot_order'])
+        self.assertEqual(client.tokens, 1)
+        self.assertEqual([q['tt'] for _, q in server.queries[:3]], ['0', '100', '101'])
+
+
+if __name__ == '__main__':
+    unittest.main()
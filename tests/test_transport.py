@@ -0,0 +1,90 @@
+import socket
+import threading
+import unittest
+
+from python_bitbankcc.transport import HttpClientTransport, TransportError
+
+
+class DroppingServer(object):
+    # answers the first request on a connection with keep-alive, reads the second one and closes
+    # the socket without a response, like a server that dies just after taking the request
+
+    def __init__(self):
+        self.sock = socket.socket()
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(8)
+        self.received = []
+        self.url = 'http://127.0.0.1:%d' % self.sock.getsockname()[1]
+        thread = threading.Thread(target=self._accept)
+        thread.daemon = True
+        thread.start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            thread = threading.Thread(target=self._serve, args=(conn,))
+            thread.daemon = True
+            thread.start()
+
+    def _read_request(self, conn):
+        data = b''
+        while b'\r\n\r\n' not in data:
+            chunk = conn.recv(65536)
+            if not chunk:
+                return None
+            data += chunk
+        head, body = data.split(b'\r\n\r\n', 1)
+        length = 0
+        for line in head.split(b'\r\n')[1:]:
+            name, _, value = line.partition(b':')
+            if name.strip().lower() == b'content-length':
+                length = int(value)
+        while len(body) < length:
+            body += conn.recv(65536)
+        return head.split(b'\r\n')[0].decode()
+
+    def _serve(self, conn):
+        served = 0
+        while True:
+            line = self._read_request(conn)
+            if line is None:
+                break
+            self.received.append(line)
+            if served == 1:
+                break
+            conn.sendall(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: keep-alive\r\n\r\n{}')
+            served += 1
+        conn.close()
+
+    def close(self):
+        self.sock.close()
+
+
+class HttpClientTransportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = DroppingServer()
+        self.transport = HttpClientTransport()
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.close()
+
+    def test_get_is_resent_on_dropped_reused_connection(self):
+        self.transport.get(self.server.url + '/v1/user/assets')
+        response = self.transport.get(self.server.url + '/v1/user/assets')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.server.received), 3)
+
+    def test_order_is_not_resent_on_dropped_reused_connection(self):
+        self.transport.get(self.server.url + '/v1/user/assets')
+        with self.assertRaises(TransportError):
+            self.transport.post(self.server.url + '/v1/user/spot/order', data='{"pair": "btc_jpy"}')
+        self.assertEqual(self.server.received, ['GET /v1/user/assets HTTP/1.1', 'POST /v1/user/spot/order HTTP/1.1'])
+
+
+if __name__ == '__main__':
+    unittest.main()